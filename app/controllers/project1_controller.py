@@ -4,13 +4,121 @@ Thin layer that handles request/response shaping and delegates all business
 logic to the brochure_generator service.
 """
 
-from collections.abc import AsyncGenerator
+from typing import Any
 
-from app.models.project1_models import BrochureRequest
-from app.services.brochure_generator import run_pipeline_stream
+from app.models.project1_models import (
+    BatchItemResponse,
+    BatchRequest,
+    BatchResponse,
+    BrochureRequest,
+    JobResponse,
+)
+from app.services.brochure_generator import (
+    Batch,
+    BatchItem,
+    PipelineSubscription,
+    batch_runner,
+    job_manager,
+    open_pipeline_stream,
+)
 
 
-async def handle_generate_stream(request: BrochureRequest) -> AsyncGenerator[str, None]:
-    """Return an async generator that streams brochure generation output."""
-    async for chunk in run_pipeline_stream(str(request.url)):
-        yield chunk
+def handle_generate_stream(request: BrochureRequest) -> PipelineSubscription:
+    """Return an async iterator that streams brochure generation output.
+
+    Concurrent requests for the same URL share a single pipeline run; close
+    the returned subscription when the client disconnects.
+    Raises ``PipelineBusyError`` immediately when the pipeline queue is full.
+    """
+    return open_pipeline_stream(str(request.url))
+
+
+def _item_response(index: int, item: BatchItem, *, with_brochure: bool) -> BatchItemResponse:
+    return BatchItemResponse(
+        index=index,
+        url=item.url,
+        status=item.status,
+        error=item.error,
+        started_at=item.started_at,
+        finished_at=item.finished_at,
+        brochure=item.brochure if with_brochure else None,
+    )
+
+
+def _batch_response(batch: Batch) -> BatchResponse:
+    return BatchResponse(
+        batch_id=batch.id,
+        status=batch.status,
+        created_at=batch.created_at,
+        finished_at=batch.finished_at,
+        counts=batch.counts(),
+        items=[_item_response(i, item, with_brochure=False) for i, item in enumerate(batch.items)],
+    )
+
+
+def handle_create_batch(request: BatchRequest) -> BatchResponse:
+    """Queue a batch of URLs for background generation."""
+    return _batch_response(batch_runner.submit([str(url) for url in request.urls]))
+
+
+def handle_get_batch(batch_id: str) -> BatchResponse | None:
+    """Status of every item of a batch (``None`` if the batch is unknown)."""
+    batch = batch_runner.get(batch_id)
+    return _batch_response(batch) if batch is not None else None
+
+
+def handle_get_batch_item(batch_id: str, index: int) -> BatchItemResponse | None:
+    """One item of a batch, including its brochure once generated."""
+    batch = batch_runner.get(batch_id)
+    if batch is None or not 0 <= index < len(batch.items):
+        return None
+    return _item_response(index, batch.items[index], with_brochure=True)
+
+
+def _job_response(job: dict[str, Any]) -> JobResponse:
+    return JobResponse(
+        job_id=job["id"],
+        url=job["url"],
+        run_id=job["run_id"],
+        status=job["status"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        finished_at=job["finished_at"],
+        error=job["error"],
+        brochure=job["brochure"],
+    )
+
+
+async def handle_submit_job(request: BrochureRequest) -> JobResponse:
+    """Start a background job; raises ``PipelineBusyError`` when the queue is full."""
+    job_id = await job_manager.submit(str(request.url))
+    return _job_response(await job_manager.get(job_id))
+
+
+async def handle_retry_job(job_id: str) -> JobResponse | None:
+    """Retry a failed or interrupted job from its checkpoints (``None`` if unknown).
+
+    Raises ``JobStateError`` if the job can't be retried and
+    ``PipelineBusyError`` when the queue is full.
+    """
+    if not await job_manager.retry(job_id):
+        return None
+    return _job_response(await job_manager.get(job_id))
+
+
+async def handle_get_job(job_id: str) -> JobResponse | None:
+    """Current state of a job (``None`` if unknown or expired)."""
+    job = await job_manager.get(job_id)
+    return _job_response(job) if job is not None else None
+
+
+async def handle_job_stream(job_id: str) -> PipelineSubscription | str | None:
+    """The job's live stream if it is still running, else its stored output.
+
+    ``None`` if the job is unknown or expired.
+    """
+    live = job_manager.reattach(job_id)
+    if live is not None:
+        return live
+    job = await job_manager.get(job_id)
+    return job["output"] if job is not None else None
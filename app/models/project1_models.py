@@ -1,5 +1,44 @@
-from pydantic import BaseModel, HttpUrl
+from typing import Literal
+
+from pydantic import BaseModel, Field, HttpUrl
+
+from config.settings import settings
 
 
 class BrochureRequest(BaseModel):
     url: HttpUrl
+
+
+class BatchRequest(BaseModel):
+    urls: list[HttpUrl] = Field(min_length=1, max_length=settings.batch_max_urls)
+
+
+class BatchItemResponse(BaseModel):
+    index: int
+    url: str
+    status: Literal["queued", "running", "done", "failed"]
+    error: str | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+    brochure: str | None = None
+
+
+class BatchResponse(BaseModel):
+    batch_id: str
+    status: Literal["queued", "running", "done"]
+    created_at: float
+    finished_at: float | None = None
+    counts: dict[str, int]
+    items: list[BatchItemResponse]
+
+
+class JobResponse(BaseModel):
+    job_id: str
+    url: str
+    run_id: str | None = None
+    status: Literal["running", "done", "failed", "interrupted"]
+    created_at: float
+    updated_at: float
+    finished_at: float | None = None
+    error: str | None = None
+    brochure: str | None = None
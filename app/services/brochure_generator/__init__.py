@@ -1,3 +1,21 @@
-from app.services.brochure_generator.task_manager import run_pipeline_stream
+from app.services.brochure_generator.admission import PipelineBusyError
+from app.services.brochure_generator.batch import Batch, BatchItem, batch_runner
+from app.services.brochure_generator.jobs import JobStateError, job_manager
+from app.services.brochure_generator.single_flight import (
+    PipelineSubscription,
+    open_pipeline_stream,
+)
+from app.services.brochure_generator.task_manager import PipelineOutcome, run_pipeline_stream
 
-__all__ = ["run_pipeline_stream"]
+__all__ = [
+    "Batch",
+    "BatchItem",
+    "JobStateError",
+    "PipelineBusyError",
+    "PipelineOutcome",
+    "PipelineSubscription",
+    "batch_runner",
+    "job_manager",
+    "open_pipeline_stream",
+    "run_pipeline_stream",
+]
@@ -0,0 +1,154 @@
+"""Admission control and per-stage concurrency budgets for the pipeline.
+
+Two layers keep a burst of requests from overrunning the process and the
+Gemini quota:
+
+* **Admission** — at most ``pipeline_max_active`` pipeline runs execute at
+  once; up to ``pipeline_max_queued`` more wait in a FIFO queue and are told
+  their position.  Beyond that, :meth:`AdmissionController.reserve` raises
+  :class:`PipelineBusyError` immediately so the route can answer with a fast
+  503 + ``Retry-After`` instead of a request that times out.
+* **Stage budgets** — across *all* runs, at most ``stage_fetch_limit`` page
+  fetches, ``stage_clean_limit`` page cleanings and ``stage_llm_limit`` Gemini
+  requests are in progress at any moment (:data:`stage_limits`).  An LLM
+  slot covers one summary request, or one streamed brochure request from
+  its first to its last token.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import AsyncGenerator
+
+from config.settings import settings
+
+logger = logging.getLogger("app.admission")
+
+
+class PipelineBusyError(Exception):
+    """Raised when both the active slots and the wait queue are full."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"Pipeline queue is full — retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """A reserved place in the pipeline: either running or queued.
+
+    Use as ``async with ticket:`` — the slot is released on exit, and a
+    ticket abandoned while still queued simply leaves the queue.
+    """
+
+    def __init__(self, controller: "AdmissionController") -> None:
+        self._controller = controller
+        self.granted = False
+
+    @property
+    def position(self) -> int:
+        """1-based place in the wait queue (``0`` once running)."""
+        return self._controller.position(self)
+
+    async def wait(self) -> AsyncGenerator[int, None]:
+        """Yield the queue position each time it changes; return once running."""
+        last_position = None
+        while not self.granted:
+            position = self.position
+            if position != last_position:
+                last_position = position
+                yield position
+            await self._controller.changed()
+
+    async def __aenter__(self) -> "Ticket":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._controller.release(self)
+
+
+class AdmissionController:
+    """Bounded active set plus bounded FIFO wait queue."""
+
+    def __init__(self, max_active: int, max_queued: int, retry_after: int) -> None:
+        self.max_active = max(1, max_active)
+        self.max_queued = max(0, max_queued)
+        self.retry_after = retry_after
+        self.active = 0
+        self._waiting: deque[Ticket] = deque()
+        self._changed = asyncio.Event()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiting)
+
+    def reserve(self) -> Ticket:
+        """Take a slot (or a place in the queue) without waiting.
+
+        Raises :class:`PipelineBusyError` when the queue is full.
+        """
+        ticket = Ticket(self)
+        if self.active < self.max_active and not self._waiting:
+            self.active += 1
+            ticket.granted = True
+        elif len(self._waiting) < self.max_queued:
+            self._waiting.append(ticket)
+            logger.info("Pipeline queued at position %d", len(self._waiting))
+        else:
+            logger.warning(
+                "Pipeline rejected — %d active, %d queued", self.active, len(self._waiting)
+            )
+            raise PipelineBusyError(self.retry_after)
+        return ticket
+
+    def position(self, ticket: Ticket) -> int:
+        if ticket.granted:
+            return 0
+        try:
+            return self._waiting.index(ticket) + 1
+        except ValueError:
+            return 0
+
+    def release(self, ticket: Ticket) -> None:
+        if ticket.granted:
+            ticket.granted = False
+            self.active -= 1
+        else:
+            try:
+                self._waiting.remove(ticket)
+            except ValueError:
+                return
+
+        while self._waiting and self.active < self.max_active:
+            self._waiting.popleft().granted = True
+            self.active += 1
+        self._notify()
+
+    async def changed(self) -> None:
+        """Wait until the queue moves."""
+        await self._changed.wait()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+class StageLimits:
+    """Process-wide concurrency budgets for the fetch, clean and LLM stages."""
+
+    def __init__(self, fetch: int, clean: int, llm: int) -> None:
+        self.fetch = asyncio.Semaphore(max(1, fetch))
+        self.clean = asyncio.Semaphore(max(1, clean))
+        self.llm = asyncio.Semaphore(max(1, llm))
+
+
+admission = AdmissionController(
+    max_active=settings.pipeline_max_active,
+    max_queued=settings.pipeline_max_queued,
+    retry_after=settings.pipeline_retry_after_seconds,
+)
+
+stage_limits = StageLimits(
+    fetch=settings.stage_fetch_limit,
+    clean=settings.stage_clean_limit,
+    llm=settings.stage_llm_limit,
+)
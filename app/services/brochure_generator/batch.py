@@ -0,0 +1,160 @@
+"""Batch brochure generation.
+
+A batch is a list of URLs submitted at once; :func:`BatchRunner.submit`
+returns immediately with a batch ID and the items are worked off in the
+background by a fixed pool of ``batch_workers`` worker tasks shared by all
+batches.  Each item is a normal ``run_pipeline_stream`` run, so batches go
+through the same process-wide fetch / clean / LLM budgets
+(:data:`~app.services.brochure_generator.admission.stage_limits`) and the
+same caches as interactive requests.
+
+Batches never take admission slots, and a worker does not start its next
+item while interactive requests are waiting in the admission queue — so a
+large batch slows interactive streaming down at most to sharing the stage
+budgets with ``batch_workers`` runs, and never starves it.
+
+Batches live in memory; finished ones are forgotten after
+``batch_retention_seconds``.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Literal
+
+from app.services.brochure_generator.admission import admission
+from app.services.brochure_generator.task_manager import run_pipeline_stream
+from config.settings import settings
+
+logger = logging.getLogger("app.batch")
+
+ItemStatus = Literal["queued", "running", "done", "failed"]
+
+
+@dataclass
+class BatchItem:
+    """One URL of a batch and, once finished, its brochure or error."""
+
+    url: str
+    status: ItemStatus = "queued"
+    brochure: str | None = None
+    error: str | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+
+
+@dataclass
+class Batch:
+    id: str
+    items: list[BatchItem]
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+
+    @property
+    def status(self) -> Literal["queued", "running", "done"]:
+        if self.finished_at is not None:
+            return "done"
+        if all(item.status == "queued" for item in self.items):
+            return "queued"
+        return "running"
+
+    def counts(self) -> dict[str, int]:
+        counts = dict.fromkeys(("queued", "running", "done", "failed"), 0)
+        for item in self.items:
+            counts[item.status] += 1
+        return counts
+
+
+class BatchRunner:
+    """Fixed pool of worker tasks draining one FIFO queue of batch items."""
+
+    def __init__(self, workers: int, retention_seconds: float) -> None:
+        self.workers = max(1, workers)
+        self.retention_seconds = retention_seconds
+        self._batches: dict[str, Batch] = {}
+        self._queue: asyncio.Queue[tuple[Batch, BatchItem]] = asyncio.Queue()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def submit(self, urls: list[str]) -> Batch:
+        """Queue ``urls`` as a new batch and return it straight away."""
+        self._prune()
+        batch = Batch(id=uuid.uuid4().hex, items=[BatchItem(url=url) for url in urls])
+        self._batches[batch.id] = batch
+        for item in batch.items:
+            self._queue.put_nowait((batch, item))
+
+        # Workers are started lazily: they need the running event loop
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._worker(), name=f"batch-worker-{i}")
+                for i in range(self.workers)
+            ]
+        logger.info("Batch %s queued with %d URL(s)", batch.id, len(batch.items))
+        return batch
+
+    @property
+    def queued(self) -> int:
+        """Items waiting for a worker, across all batches."""
+        return self._queue.qsize()
+
+    def get(self, batch_id: str) -> Batch | None:
+        return self._batches.get(batch_id)
+
+    async def shutdown(self) -> None:
+        """Stop the workers; items still queued are abandoned."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            batch_id
+            for batch_id, batch in self._batches.items()
+            if batch.finished_at is not None and batch.finished_at < cutoff
+        ]
+        for batch_id in expired:
+            del self._batches[batch_id]
+
+    async def _worker(self) -> None:
+        while True:
+            batch, item = await self._queue.get()
+            try:
+                # Interactive requests go first: wait while any are queued
+                while admission.queued:
+                    await admission.changed()
+                await self._run_item(item)
+            finally:
+                self._queue.task_done()
+            if batch.finished_at is None and all(
+                i.status in ("done", "failed") for i in batch.items
+            ):
+                batch.finished_at = time.time()
+                counts = batch.counts()
+                logger.info(
+                    "Batch %s finished — %d done, %d failed",
+                    batch.id, counts["done"], counts["failed"],
+                )
+
+    async def _run_item(self, item: BatchItem) -> None:
+        item.status = "running"
+        item.started_at = time.time()
+        try:
+            item.brochure = "".join(
+                [chunk async for chunk in run_pipeline_stream(item.url, progress=False)]
+            )
+            item.status = "done"
+        except Exception as exc:
+            item.error = str(exc)
+            item.status = "failed"
+        finally:
+            item.finished_at = time.time()
+
+
+batch_runner = BatchRunner(
+    workers=settings.batch_workers,
+    retention_seconds=settings.batch_retention_seconds,
+)
@@ -0,0 +1,73 @@
+"""Stage checkpoints for resumable pipeline runs.
+
+Pipeline runs started with a run ID — background jobs — store their stage
+outputs under it as they progress (runs without one store nothing):
+
+* ``main_page`` — the main page's HTML and the filtered related URLs;
+* ``related_pages`` — the fetched related pages (``staged`` mode);
+* ``cleaned`` — the cleaned, combined text;
+* ``summaries`` — map-phase chunk summaries, saved in the background as they
+  complete (one write at a time, each taking every summary so far).
+
+When a run with the same ID is started again — a job retried after a
+transient LLM failure, or after a restart — it resumes at the first stage
+without a checkpoint instead of scraping and summarising from scratch.  A
+run that completes deletes its checkpoints; the rest expire after
+``checkpoint_ttl_seconds``.
+"""
+
+import logging
+from functools import cache
+from pathlib import Path
+from typing import Any, Literal
+
+from app.utilities.disk_cache import DiskCache
+from config.settings import settings
+
+logger = logging.getLogger("app.checkpoints")
+
+Stage = Literal["main_page", "related_pages", "cleaned", "summaries"]
+
+_STAGES: tuple[Stage, ...] = ("main_page", "related_pages", "cleaned", "summaries")
+
+
+@cache
+def _get_checkpoint_store() -> DiskCache | None:
+    if not settings.checkpoint_enabled:
+        return None
+    return DiskCache(
+        Path(settings.cache_dir) / "checkpoints",
+        ttl_seconds=settings.checkpoint_ttl_seconds,
+        max_bytes=settings.checkpoint_max_bytes,
+    )
+
+
+class RunCheckpoint:
+    """The stored stage outputs of one run.  File I/O — call off the event
+    loop for large values."""
+
+    def __init__(self, store: DiskCache, run_id: str) -> None:
+        self._store = store
+        self.run_id = run_id
+
+    def _key(self, stage: Stage) -> str:
+        return f"run:{self.run_id}:{stage}"
+
+    def load(self, stage: Stage) -> Any | None:
+        return self._store.get(self._key(stage))
+
+    def save(self, stage: Stage, value: Any) -> None:
+        self._store.set(self._key(stage), value)
+
+    def clear(self) -> None:
+        """Delete every stage of the run (it completed)."""
+        for stage in _STAGES:
+            self._store.delete(self._key(stage))
+
+
+def open_checkpoint(run_id: str | None) -> RunCheckpoint | None:
+    """The checkpoint of ``run_id``, or ``None`` without a run ID or when disabled."""
+    store = _get_checkpoint_store()
+    if run_id is None or store is None:
+        return None
+    return RunCheckpoint(store, run_id)
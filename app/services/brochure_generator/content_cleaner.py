@@ -1,41 +1,116 @@
 """Combine and clean scraped HTML content.
 
 Takes raw HTML from the main page and related pages, extracts readable text,
-and produces a single cleaned text blob ready for the LLM.
+and produces a single cleaned text blob ready for the LLM.  Extraction is
+CPU-bound; with ``clean_backend = "process"`` pages are cleaned in parallel
+on a shared pool of worker processes instead of GIL-bound threads.
 """
 
+import asyncio
 import logging
+import multiprocessing
+import os
 import re
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import cache
 
-from readability import Document as ReadabilityDocument
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml.html import HtmlElement
+
+from app.services.brochure_generator import metrics
+from app.services.brochure_generator.admission import stage_limits
+from app.services.brochure_generator.deduplicator import deduplicate_pages
+from config.settings import settings
 
 logger = logging.getLogger("app.content_cleaner")
 
+# Joins page sections in the combined text; the summarizer splits on it too.
+PAGE_SEPARATOR = "\n\n---\n\n"
+
+# Elements dropped (with their content) before extracting text.  Comments and
+# processing instructions go too — they never carry visible text.
+_DROP_TAGS = ("script", "style", "nav", "footer", "header", "noscript", "svg", "iframe")
+
+# Runs of 3+ newlines collapse to a blank line; runs of 2+ spaces/tabs to one space.
+_WHITESPACE_RUNS = re.compile(r"\n{3,}|[ \t]{2,}")
+
+
+@cache
+def _readability() -> tuple[type, Callable, Callable]:
+    """readability-lxml's document class, ``build_doc`` and ``get_title``.
+
+    Imported on first use rather than at startup (and once per worker
+    process with the process backend).
+    """
+    from readability import Document as ReadabilityDocument
+    from readability.htmls import build_doc, get_title
+
+    class _ArticleDocument(ReadabilityDocument):
+        """Readability document that keeps the extracted article as an lxml tree.
+
+        ``summary()`` hands its result to ``get_clean_html`` to be serialised;
+        capturing the node there spares us parsing that string back.  Readability
+        works on a deep copy of the tree it is given, so the caller's tree stays
+        intact for the fallback path.
+        """
+
+        article: HtmlElement | None = None
+
+        def get_clean_html(self) -> str:
+            self.article = self.html
+            return super().get_clean_html()
+
+    return _ArticleDocument, build_doc, get_title
+
+
+def preload() -> None:
+    """Import readability-lxml now instead of on the first page cleaned."""
+    _readability()
+
+
+def _collapse_whitespace(match: re.Match[str]) -> str:
+    return "\n\n" if match.group(0)[0] == "\n" else " "
+
+
+def _element_text(root: HtmlElement) -> str:
+    """Return the visible text under *root*, one stripped text node per line.
+
+    Drops ``_DROP_TAGS`` in place and walks the tree once — the same output
+    as BeautifulSoup's ``get_text(separator="\\n", strip=True)``.
+    """
+    if root.tag in _DROP_TAGS:
+        return ""
+    etree.strip_elements(root, *_DROP_TAGS, etree.Comment, etree.ProcessingInstruction, with_tail=False)
+    return "\n".join(part for part in (node.strip() for node in root.itertext()) if part)
+
 
 def _extract_text_from_html(html: str) -> str:
-    """Use readability-lxml to get main content, then strip remaining tags."""
+    """Use readability-lxml to get main content, then strip remaining tags.
+
+    The page is parsed once; readability, tag removal, text extraction and
+    whitespace normalisation all work from that lxml tree.
+    """
+    article_document, build_doc, get_title = _readability()
+    try:
+        tree, _ = build_doc(html)
+    except (etree.ParserError, ValueError):
+        return ""  # empty / unparseable document
+
     try:
-        doc = ReadabilityDocument(html)
-        summary_html = doc.summary()
-        title = doc.title()
+        title = get_title(tree)
+        doc = article_document(tree)
+        doc.summary()
+        article = doc.article if doc.article is not None else tree
     except Exception:
         # Fallback: just use raw HTML
-        summary_html = html
+        article = tree
         title = ""
 
-    soup = BeautifulSoup(summary_html, "html.parser")
-
-    # Remove script, style, nav, footer, header tags
-    for tag in soup.find_all(["script", "style", "nav", "footer", "header", "noscript", "svg", "iframe"]):
-        tag.decompose()
-
-    text = soup.get_text(separator="\n", strip=True)
-
-    # Collapse multiple blank lines
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    # Collapse multiple spaces
-    text = re.sub(r"[ \t]{2,}", " ", text)
+    text = _WHITESPACE_RUNS.sub(_collapse_whitespace, _element_text(article))
 
     if title:
         text = f"# {title}\n\n{text}"
@@ -43,6 +118,112 @@ def _extract_text_from_html(html: str) -> str:
     return text.strip()
 
 
+# ---------------------------------------------------------------------------
+# Cleaning backends
+# ---------------------------------------------------------------------------
+
+_clean_pool: ProcessPoolExecutor | None = None
+_clean_pool_lock = threading.Lock()
+
+
+def _get_clean_pool() -> ProcessPoolExecutor | None:
+    """Return the shared worker-process pool, or ``None`` for the thread backend.
+
+    The pool is created on first use and lives until :func:`shutdown_clean_pool`
+    (called on app shutdown), so worker start-up is paid once per process.
+    """
+    global _clean_pool
+    if settings.clean_backend != "process":
+        return None
+    with _clean_pool_lock:
+        if _clean_pool is None:
+            workers = settings.clean_workers or os.cpu_count() or 1
+            # "spawn" — forking a process that already runs threads is unsafe
+            _clean_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info("Started content-cleaning process pool with %d worker(s)", workers)
+        return _clean_pool
+
+
+def shutdown_clean_pool() -> None:
+    """Stop the worker-process pool, if one was started."""
+    global _clean_pool
+    with _clean_pool_lock:
+        if _clean_pool is not None:
+            _clean_pool.shutdown(cancel_futures=True)
+            _clean_pool = None
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    global _clean_pool
+    with _clean_pool_lock:
+        if _clean_pool is pool:
+            _clean_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def extract_text(html: str) -> str:
+    """Extract one page's text off the event loop, on the configured backend.
+
+    At most ``stage_limits.clean`` pages are cleaned at once, process-wide.
+    """
+    async with stage_limits.clean:
+        started = time.perf_counter()
+        try:
+            return await _extract_text_off_loop(html)
+        finally:
+            metrics.clean_seconds.observe(time.perf_counter() - started)
+
+
+async def _extract_text_off_loop(html: str) -> str:
+    pool = _get_clean_pool()
+    if pool is None:
+        return await asyncio.to_thread(_extract_text_from_html, html)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, _extract_text_from_html, html)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a huge page); start a fresh pool next time
+        logger.warning("Content-cleaning process pool broke — restarting it")
+        _discard_broken_pool(pool)
+        return await asyncio.to_thread(_extract_text_from_html, html)
+
+
+# ---------------------------------------------------------------------------
+# Combining pages
+# ---------------------------------------------------------------------------
+
+def format_section(page_text: str, url: str | None = None) -> str:
+    """Return one page's section of the combined document (``url=None`` for the main page)."""
+    if url is None:
+        return f"=== MAIN PAGE ===\n{page_text}"
+    return f"=== PAGE: {url} ===\n{page_text}"
+
+
+def join_sections(main_text: str, related: list[tuple[str, str]]) -> str:
+    """Join page texts into the combined document, skipping empty pages.
+
+    ``related`` holds ``(url, text)`` pairs in the order they should appear.
+    Content repeated from an earlier page is removed first (see
+    :mod:`~app.services.brochure_generator.deduplicator`).
+    """
+    pages: list[tuple[str | None, str]] = [(None, main_text), *related]
+    if settings.dedup_enabled:
+        pages = deduplicate_pages(pages)
+    return join_pages(pages)
+
+
+def join_pages(pages: list[tuple[str | None, str]]) -> str:
+    """Join already deduplicated ``(url, text)`` pages, main page first, skipping empty ones."""
+    sections = [format_section(page_text, url) for url, page_text in pages if page_text]
+
+    combined = PAGE_SEPARATOR.join(sections)
+    logger.info("Combined cleaned text length: %d characters", len(combined))
+    return combined
+
+
 def combine_and_clean(main_html: str, related_pages: list[dict[str, str]]) -> str:
     """Merge main page + related pages into one cleaned text document.
 
@@ -58,19 +239,24 @@ def combine_and_clean(main_html: str, related_pages: list[dict[str, str]]) -> st
     str
         A single cleaned text blob.
     """
-    sections: list[str] = []
+    htmls = [main_html] + [page["html"] for page in related_pages]
 
-    # Main page
-    main_text = _extract_text_from_html(main_html)
-    if main_text:
-        sections.append(f"=== MAIN PAGE ===\n{main_text}")
+    pool = _get_clean_pool()
+    if pool is not None:
+        texts = list(pool.map(_extract_text_from_html, htmls))
+    else:
+        texts = [_extract_text_from_html(html) for html in htmls]
 
-    # Related pages
-    for page in related_pages:
-        page_text = _extract_text_from_html(page["html"])
-        if page_text:
-            sections.append(f"=== PAGE: {page['url']} ===\n{page_text}")
+    return join_sections(texts[0], [(page["url"], text) for page, text in zip(related_pages, texts[1:])])
 
-    combined = "\n\n---\n\n".join(sections)
-    logger.info("Combined cleaned text length: %d characters", len(combined))
-    return combined
+
+async def acombine_and_clean(main_html: str, related_pages: list[dict[str, str]]) -> str:
+    """Async :func:`combine_and_clean`: pages are cleaned in parallel on the
+    configured backend while the event loop stays free.  Section order and
+    headers are identical to the sync version.
+    """
+    texts = await asyncio.gather(
+        extract_text(main_html),
+        *(extract_text(page["html"]) for page in related_pages),
+    )
+    return join_sections(texts[0], [(page["url"], text) for page, text in zip(related_pages, texts[1:])])
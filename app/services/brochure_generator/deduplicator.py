@@ -0,0 +1,126 @@
+"""Cross-page boilerplate and duplicate-content removal.
+
+Pages of one site repeat the same cookie banners, CTA paragraphs and
+sign-up blurbs, and sometimes the same page is reachable under two URLs
+(``/about`` and ``/about-us``).  Before the text reaches the LLM:
+
+* a page whose word shingles are near-identical to an earlier page's is
+  dropped entirely;
+* a text block (line) already seen on an earlier page is dropped from later
+  pages.
+
+The first occurrence always wins, so the main page keeps everything.
+"""
+
+import logging
+import re
+
+from config.settings import settings
+
+logger = logging.getLogger("app.deduplicator")
+
+_WORDS = re.compile(r"\w+")
+_BLANK_RUNS = re.compile(r"\n{3,}")
+
+# Words per shingle for page fingerprints
+_SHINGLE_WORDS = 5
+
+# Pages with fewer shingles than this are never treated as whole-page
+# duplicates — a short page is mostly shared boilerplate by nature.
+_MIN_PAGE_SHINGLES = 50
+
+# Blocks shorter than this many words are kept even when repeated: a lone
+# "Learn more" costs nothing, a repeated price or heading may matter.
+_MIN_BLOCK_WORDS = 4
+
+
+def _shingles(words: list[str]) -> set[int]:
+    """Hashes of every run of ``_SHINGLE_WORDS`` consecutive words."""
+    if len(words) < _SHINGLE_WORDS:
+        return {hash(tuple(words))} if words else set()
+    return {
+        hash(tuple(words[i : i + _SHINGLE_WORDS]))
+        for i in range(len(words) - _SHINGLE_WORDS + 1)
+    }
+
+
+def _similarity(a: set[int], b: set[int]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class PageDeduplicator:
+    """Incremental form of :func:`deduplicate_pages`.
+
+    Feed pages one at a time with :meth:`add`, in document order; each call
+    returns that page's text with content already seen on earlier pages
+    removed, so a page's final text is known as soon as every page before
+    it has been added.
+    """
+
+    def __init__(self) -> None:
+        self._seen_blocks: set[str] = set()
+        self._kept: list[set[int]] = []  # shingles of the pages kept so far
+        self.dropped_pages = 0
+        self.dropped_blocks = 0
+        self.chars_in = 0
+        self.chars_out = 0
+
+    def add(self, url: str | None, text: str) -> str:
+        """Deduplicate the next page against the pages added before it."""
+        self.chars_in += len(text)
+        if not text:
+            return text
+
+        shingles = _shingles(_WORDS.findall(text.lower()))
+        if len(shingles) >= _MIN_PAGE_SHINGLES and any(
+            _similarity(shingles, kept_shingles) >= settings.dedup_page_similarity
+            for kept_shingles in self._kept
+        ):
+            logger.info("Dropped %s — near-duplicate of an earlier page", url)
+            self.dropped_pages += 1
+            return ""
+        self._kept.append(shingles)
+
+        # Blocks are only checked against *earlier* pages: repeats within a
+        # page are left alone.
+        lines: list[str] = []
+        page_blocks: set[str] = set()
+        for line in text.split("\n"):
+            words = _WORDS.findall(line.lower())
+            if len(words) >= _MIN_BLOCK_WORDS:
+                key = " ".join(words)
+                if key in self._seen_blocks:
+                    self.dropped_blocks += 1
+                    continue
+                page_blocks.add(key)
+            lines.append(line)
+        self._seen_blocks |= page_blocks
+
+        deduplicated = _BLANK_RUNS.sub("\n\n", "\n".join(lines)).strip()
+        self.chars_out += len(deduplicated)
+        return deduplicated
+
+    def log_summary(self) -> None:
+        if self.dropped_pages or self.dropped_blocks:
+            logger.info(
+                "Deduplication removed %d repeated block(s) and %d duplicate page(s) "
+                "(%d → %d characters)",
+                self.dropped_blocks, self.dropped_pages, self.chars_in, self.chars_out,
+            )
+
+
+def deduplicate_pages(pages: list[tuple[str | None, str]]) -> list[tuple[str | None, str]]:
+    """Remove near-duplicate pages and cross-page repeated blocks.
+
+    ``pages`` holds ``(url, text)`` pairs in document order (``url`` is
+    ``None`` for the main page).  Returns the pairs in the same order with
+    duplicate content removed; a page left with no text keeps an empty
+    string so callers can skip it as they do empty pages.
+    """
+    deduplicator = PageDeduplicator()
+    result = [(url, deduplicator.add(url, text)) for url, text in pages]
+    deduplicator.log_summary()
+    return result
@@ -0,0 +1,131 @@
+"""On-disk HTTP response cache for the scraper.
+
+Pages younger than the TTL are served straight from disk (a TTL of ``0``
+never expires, as everywhere else :class:`~app.utilities.disk_cache.DiskCache`
+is used).  Older pages that were stored with an ``ETag`` or
+``Last-Modified`` validator are revalidated with a conditional request, so
+an unchanged page costs a ``304`` instead of a full download.  Storage, TTL
+and LRU size bounds come from :class:`app.utilities.disk_cache.DiskCache`.
+"""
+
+import logging
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
+
+from app.utilities.disk_cache import DiskCache
+from config.settings import settings
+
+logger = logging.getLogger("app.http_cache")
+
+
+@dataclass
+class FetchedPage:
+    """The parts of an HTTP response the cache needs."""
+
+    status: int
+    html: str
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+    def header(self, name: str) -> str | None:
+        name = name.lower()
+        for key, value in self.headers.items():
+            if key.lower() == name:
+                return value
+        return None
+
+
+# ``fetch(url, request_headers)`` — performs the actual network request
+FetchFn = Callable[[str, dict[str, str]], FetchedPage]
+
+
+class HttpCache:
+    """Cache of fetched HTML keyed by URL, with conditional revalidation.
+
+    Counters (``stats()``):
+        hits         served from disk without touching the network
+        revalidated  stale entry confirmed unchanged by a 304
+        misses       full download (no entry, or the page changed)
+        stores       responses written to disk
+    """
+
+    def __init__(self, directory: str | Path, *, ttl_seconds: float, max_bytes: int) -> None:
+        self._store = DiskCache(directory, ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stores = 0
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def fetch(self, url: str, fetch: FetchFn) -> str:
+        """Return the HTML for ``url``, going to the network only when needed."""
+        entry = self._store.get_entry(url)
+
+        if entry is not None and entry.is_fresh(self.ttl_seconds):
+            self._count("hits")
+            logger.debug("HTTP cache hit: %s", url)
+            return entry.value["html"]
+
+        request_headers: dict[str, str] = {}
+        if entry is not None:
+            if entry.value.get("etag"):
+                request_headers["If-None-Match"] = entry.value["etag"]
+            if entry.value.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry.value["last_modified"]
+
+        page = fetch(url, request_headers)
+
+        if page.status == 304 and entry is not None:
+            self._count("revalidated")
+            logger.debug("HTTP cache revalidated (304): %s", url)
+            self._store.set(url, entry.value)  # restart the TTL
+            return entry.value["html"]
+
+        self._count("misses")
+        if self._is_cacheable(page):
+            self._store.set(
+                url,
+                {
+                    "html": page.html,
+                    "etag": page.header("ETag"),
+                    "last_modified": page.header("Last-Modified"),
+                },
+            )
+            self._count("stores")
+        return page.html
+
+    @staticmethod
+    def _is_cacheable(page: FetchedPage) -> bool:
+        if not 200 <= page.status < 300 or not page.html:
+            return False
+        cache_control = (page.header("Cache-Control") or "").lower()
+        return "no-store" not in cache_control
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self._store.evictions,
+            "size_bytes": self._store.stats()["size_bytes"],
+        }
+
+
+@cache
+def get_http_cache() -> HttpCache | None:
+    """Return the process-wide HTTP cache, or ``None`` when it is disabled."""
+    if not settings.http_cache_enabled:
+        return None
+    return HttpCache(
+        Path(settings.cache_dir) / "http",
+        ttl_seconds=settings.http_cache_ttl_seconds,
+        max_bytes=settings.http_cache_max_bytes,
+    )
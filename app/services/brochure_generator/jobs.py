@@ -0,0 +1,273 @@
+"""Background brochure jobs that outlive the HTTP connection.
+
+A job is a pipeline run started on behalf of a client that does not need
+to stay connected: :meth:`JobManager.submit` returns a job ID at once, the
+run continues in the background, and its state, stream output and finished
+brochure are written to a local SQLite database.  Clients poll the job, or
+reattach to its live stream — while the run is in progress they receive
+every chunk from the first one, exactly like a late joiner of a coalesced
+run; afterwards the stored output is replayed.
+
+A job holds its own subscription to the (coalesced) pipeline run, so a
+client disconnecting never cancels it.  Jobs still marked as running when
+the process starts were cut off by a restart and are marked
+``interrupted``.  Finished jobs are deleted after ``jobs_retention_seconds``.
+
+A job starts its pipeline run with a run ID of its own and records it, so
+retrying a failed or interrupted job resumes the run from its stage
+checkpoints.  (A job that joins a run already in flight for an interactive
+request records none; retrying it starts a fresh, checkpointed run.)
+"""
+
+import asyncio
+import logging
+import sqlite3
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+from app.services.brochure_generator.single_flight import (
+    PipelineSubscription,
+    open_pipeline_stream,
+)
+from app.utilities.disk_cache import resolve_cache_dir
+from config.settings import settings
+
+logger = logging.getLogger("app.jobs")
+
+# Only jobs in these states can be retried
+_RETRYABLE = ("failed", "interrupted")
+
+# A running job's output is written to the database at most this often
+_FLUSH_INTERVAL_SECONDS = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    url         TEXT NOT NULL,
+    run_id      TEXT,
+    status      TEXT NOT NULL,
+    output      TEXT NOT NULL DEFAULT '',
+    brochure    TEXT,
+    error       TEXT,
+    created_at  REAL NOT NULL,
+    updated_at  REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_finished_at ON jobs (finished_at);
+"""
+
+
+class JobStateError(Exception):
+    """The job exists but is not in a state that allows the operation."""
+
+
+class JobStore:
+    """SQLite table of jobs.  Every call opens its own connection, so the
+    store is safe to use from worker threads."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = resolve_cache_dir(str(path))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "run_id" not in columns:  # database created before run IDs
+                conn.execute("ALTER TABLE jobs ADD COLUMN run_id TEXT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """A connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, job_id: str, url: str, run_id: str | None) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, url, run_id, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, url, run_id, "running", now, now),
+            )
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def mark_interrupted(self) -> int:
+        """Mark jobs left running by a previous process as interrupted."""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'interrupted', updated_at = ?, finished_at = ? "
+                "WHERE status = 'running'",
+                (now, now),
+            )
+        return cursor.rowcount
+
+    def prune(self, finished_before: float) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM jobs WHERE finished_at < ?", (finished_before,))
+        return cursor.rowcount
+
+
+class JobManager:
+    """Starts jobs, tracks the ones running in this process, serves their streams."""
+
+    def __init__(self, db_path: str | Path, retention_seconds: float) -> None:
+        self.db_path = db_path
+        self.retention_seconds = retention_seconds
+        self._live: dict[str, tuple[PipelineSubscription, asyncio.Task[None]]] = {}
+
+    @property
+    def running(self) -> int:
+        """Jobs running in this process."""
+        return len(self._live)
+
+    @cached_property
+    def store(self) -> JobStore:
+        # Opened on first use, so importing the package never creates the file
+        return JobStore(self.db_path)
+
+    async def startup(self) -> None:
+        interrupted = await asyncio.to_thread(self.store.mark_interrupted)
+        if interrupted:
+            logger.warning("Marked %d job(s) from a previous run as interrupted", interrupted)
+        await self.prune()
+
+    async def shutdown(self) -> None:
+        tasks = [task for _, task in self._live.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def prune(self) -> None:
+        removed = await asyncio.to_thread(
+            self.store.prune, time.time() - self.retention_seconds
+        )
+        if removed:
+            logger.info("Deleted %d expired job(s)", removed)
+
+    async def submit(self, url: str) -> str:
+        """Start a job for ``url`` and return its ID.
+
+        Raises ``PipelineBusyError`` when a new run can't be admitted.
+        """
+        subscription = open_pipeline_stream(url, run_id=uuid.uuid4().hex)
+        job_id = uuid.uuid4().hex
+        try:
+            await asyncio.to_thread(self.store.create, job_id, url, subscription.run_id)
+        except BaseException:
+            subscription.close()
+            raise
+        self._start(job_id, subscription)
+        logger.info("Job %s started for %s", job_id, url)
+        await self.prune()
+        return job_id
+
+    async def retry(self, job_id: str) -> bool:
+        """Restart a failed or interrupted job, resuming its run's checkpoints.
+
+        Returns ``False`` if the job is unknown.  Raises :class:`JobStateError`
+        if it is running or done, and ``PipelineBusyError`` when a new run
+        can't be admitted.
+        """
+        job = await self.get(job_id)
+        if job is None:
+            return False
+        if job_id in self._live or job["status"] not in _RETRYABLE:
+            raise JobStateError(
+                f"Job is {job['status']}; only failed or interrupted jobs can be retried"
+            )
+
+        run_id = job["run_id"] or uuid.uuid4().hex
+        subscription = open_pipeline_stream(job["url"], run_id=run_id)
+        try:
+            await asyncio.to_thread(
+                self.store.update,
+                job_id,
+                run_id=subscription.run_id,
+                status="running",
+                output="",
+                brochure=None,
+                error=None,
+                finished_at=None,
+            )
+        except BaseException:
+            subscription.close()
+            raise
+        self._start(job_id, subscription)
+        logger.info("Job %s retried (run %s)", job_id, subscription.run_id)
+        return True
+
+    async def get(self, job_id: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    def _start(self, job_id: str, subscription: PipelineSubscription) -> None:
+        task = asyncio.create_task(self._run(job_id, subscription), name=f"job:{job_id}")
+        self._live[job_id] = (subscription, task)
+
+    def reattach(self, job_id: str) -> PipelineSubscription | None:
+        """A new stream of the job's run from its first chunk, if it is running here."""
+        live = self._live.get(job_id)
+        return live[0].reattach() if live is not None else None
+
+    async def _run(self, job_id: str, subscription: PipelineSubscription) -> None:
+        output: list[str] = []
+        last_flush = time.monotonic()
+        try:
+            async for chunk in subscription:
+                output.append(chunk)
+                if time.monotonic() - last_flush >= _FLUSH_INTERVAL_SECONDS:
+                    await asyncio.to_thread(self.store.update, job_id, output="".join(output))
+                    last_flush = time.monotonic()
+
+            # The run's outcome, not the streamed text, says how it ended
+            outcome = subscription.outcome
+            succeeded = outcome.status == "done"
+            await asyncio.to_thread(
+                self.store.update,
+                job_id,
+                status="done" if succeeded else "failed",
+                output="".join(output),
+                brochure="".join(outcome.brochure) if succeeded else None,
+                error=None if succeeded else outcome.error or "Pipeline run ended unexpectedly",
+                finished_at=time.time(),
+            )
+            logger.info("Job %s %s", job_id, "done" if succeeded else "failed")
+        except asyncio.CancelledError:
+            # Shutting down — record how far the job got
+            await asyncio.to_thread(
+                self.store.update,
+                job_id,
+                status="interrupted",
+                output="".join(output),
+                finished_at=time.time(),
+            )
+            raise
+        finally:
+            subscription.close()
+            self._live.pop(job_id, None)
+
+
+job_manager = JobManager(
+    settings.jobs_db_path,
+    retention_seconds=settings.jobs_retention_seconds,
+)
@@ -3,23 +3,69 @@
 Takes cleaned website text, chunks it if needed, and uses an LLM to produce
 a professional brochure in Markdown format.
 
-Supports both blocking (``generate_brochure``) and streaming
-(``generate_brochure_stream``) output.
+Output is streamed by the async-native ``agenerate_brochure_stream``;
+``generate_brochure`` is a blocking wrapper over it for scripts and
+notebooks.  Finished brochures are cached on disk, keyed by the cleaned
+text, model, temperature and a hash of the prompts, so identical input
+never pays for a second generation.
 """
 
+import asyncio
+import hashlib
 import logging
-from collections.abc import Generator
-
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
+import math
+import re
+import time
+from collections.abc import AsyncGenerator, Callable, Generator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from app.services.brochure_generator import metrics
+from app.services.brochure_generator.admission import stage_limits
+from app.services.brochure_generator.content_cleaner import PAGE_SEPARATOR
+from app.utilities.disk_cache import DiskCache
 from config.settings import settings
 
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
 logger = logging.getLogger("app.llm_summarizer")
 
-_CHUNK_SIZE = 8_000
+# Token budgets are planned from an estimate rather than a count-tokens
+# round trip; 3.5 characters per token errs on the side of more tokens than
+# Gemini's tokenizer reports for typical web copy.
+_CHARS_PER_TOKEN = 3.5
+
+# Context windows of the Gemini models we expect to run; anything else falls
+# back to a conservative default (override with APP_LLM_CONTEXT_TOKENS).
+_MODEL_CONTEXT_TOKENS = {
+    "gemini-3-flash-preview": 1_048_576,
+    "gemini-3-pro-preview": 1_048_576,
+    "gemini-2.5-flash": 1_048_576,
+    "gemini-2.5-flash-lite": 1_048_576,
+    "gemini-2.5-pro": 1_048_576,
+    "gemini-2.0-flash": 1_048_576,
+}
+_DEFAULT_CONTEXT_TOKENS = 128_000
+
 _CHUNK_OVERLAP = 500
 
+_TEMPERATURE = 0.7
+
+# Map-phase progress hook: called as ``on_progress(done, total)`` each time a
+# chunk summary completes.
+ProgressCallback = Callable[[int, int], None]
+
+# Map-phase result hook: called as ``on_summary(chunk, summary)`` for every
+# summary newly produced by the LLM (not for known or cached ones).
+SummaryCallback = Callable[[str, str], None]
+
+# Cached brochures are replayed in pieces of roughly this many characters so
+# streaming clients see the same incremental output as a live generation.
+_REPLAY_CHUNK_CHARS = 48
+
 _BROCHURE_SYSTEM_PROMPT = """\
 You are a professional copywriter and marketing expert. Your task is to create \
 a polished, engaging **brochure** in Markdown format based on the website content \
@@ -42,6 +88,8 @@ Rules:
 - Output ONLY the brochure Markdown — no preamble or commentary.\
 """
 
+_SUMMARY_SYSTEM_PROMPT = "You are a helpful assistant that summarizes text accurately."
+
 _SUMMARY_PROMPT = """\
 Summarize the following website content section. Preserve all key facts, \
 services, products, statistics, and contact information. Be concise.\
@@ -58,16 +106,54 @@ Content:
 """
 
 
-def _get_llm() -> ChatGoogleGenerativeAI:
-    """Instantiate the Gemini LLM."""
+@cache
+def _llm_client(model: str, temperature: float) -> "ChatGoogleGenerativeAI":
+    """Process-wide Gemini client per (model, temperature).
+
+    The underlying ``google-genai`` client owns the HTTP connection pools, so
+    reusing one instance keeps TLS connections alive between requests.
+    LangChain is imported here, on first use, rather than at startup.
+    """
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    logger.info("Creating LLM client for %s (temperature=%s)", model, temperature)
     return ChatGoogleGenerativeAI(
-        model=settings.gemini_model,
+        model=model,
         google_api_key=settings.google_api_key,
-        temperature=0.7,
+        temperature=temperature,
         max_retries=2,
     )
 
 
+def _get_llm() -> "ChatGoogleGenerativeAI":
+    """Return the shared Gemini LLM for the configured model."""
+    return _llm_client(settings.gemini_model, _TEMPERATURE)
+
+
+def preload() -> None:
+    """Import LangChain and the Gemini SDK now instead of on the first request."""
+    import langchain_google_genai  # noqa: F401
+    import langchain_text_splitters  # noqa: F401
+
+
+async def warm_up_llm(timeout: float = 10.0) -> None:
+    """Build the shared client and open its connection ahead of the first request.
+
+    Fetches the model's metadata — no tokens are generated.  Failures are
+    logged and otherwise ignored: the first real request simply pays the
+    cold start instead.
+    """
+    if not settings.google_api_key:
+        logger.info("LLM warm-up skipped — no API key configured")
+        return
+    try:
+        llm = await asyncio.to_thread(_get_llm)
+        await asyncio.wait_for(llm.client.aio.models.get(model=settings.gemini_model), timeout)
+        logger.info("LLM client warmed up for %s", settings.gemini_model)
+    except Exception as exc:
+        logger.warning("LLM warm-up failed: %s", exc)
+
+
 def _extract_text(response) -> str:
     """Extract text from LLM response, handling both string and list formats."""
     content = response.content
@@ -91,140 +177,439 @@ def _extract_text(response) -> str:
 
 
 # ---------------------------------------------------------------------------
-# Non-streaming (kept for backward-compat / non-streaming callers)
+# Brochure result cache
+# ---------------------------------------------------------------------------
+
+@cache
+def _get_brochure_cache() -> DiskCache | None:
+    """Return the process-wide brochure cache, or ``None`` when disabled."""
+    if not settings.brochure_cache_enabled:
+        return None
+    return DiskCache(
+        Path(settings.cache_dir) / "brochures",
+        ttl_seconds=settings.brochure_cache_ttl_seconds,
+        max_bytes=settings.brochure_cache_max_bytes,
+    )
+
+
+# Identifies the brochure prompts: editing either one changes every key, so
+# brochures produced by an old prompt are never served.
+_BROCHURE_PROMPT_HASH = hashlib.sha256(
+    (_BROCHURE_SYSTEM_PROMPT + _FINAL_BROCHURE_PROMPT).encode("utf-8")
+).hexdigest()[:16]
+
+
+def _brochure_cache_key(cleaned_text: str) -> str:
+    text_hash = hashlib.sha256(cleaned_text.encode("utf-8")).hexdigest()
+    return f"brochure:{text_hash}:{settings.gemini_model}:{_TEMPERATURE}:{_BROCHURE_PROMPT_HASH}"
+
+
+def _get_cached_brochure(cleaned_text: str) -> str | None:
+    brochure_cache = _get_brochure_cache()
+    if brochure_cache is None:
+        return None
+    brochure = brochure_cache.get(_brochure_cache_key(cleaned_text))
+    if brochure is not None:
+        logger.info("Brochure cache hit — skipping LLM stage")
+    return brochure
+
+
+def _store_brochure(cleaned_text: str, brochure: str) -> None:
+    brochure_cache = _get_brochure_cache()
+    if brochure_cache is not None and brochure:
+        brochure_cache.set(_brochure_cache_key(cleaned_text), brochure)
+
+
+def _replay(brochure: str) -> Generator[str, None, None]:
+    """Yield a cached brochure in token-sized pieces, splitting on word boundaries."""
+    piece = ""
+    for word in re.findall(r"\S+\s*|\s+", brochure):
+        piece += word
+        if len(piece) >= _REPLAY_CHUNK_CHARS:
+            yield piece
+            piece = ""
+    if piece:
+        yield piece
+
+
+# ---------------------------------------------------------------------------
+# Chunking
 # ---------------------------------------------------------------------------
 
-def generate_brochure(cleaned_text: str) -> str:
-    """Generate a Markdown brochure from cleaned website text.
+def estimate_tokens(text_length: int) -> int:
+    """Estimated token count of ``text_length`` characters of cleaned text."""
+    return math.ceil(text_length / _CHARS_PER_TOKEN)
+
 
-    If the text fits within one chunk, it is sent directly. Otherwise a
-    map-reduce approach is used: each chunk is summarised first, then the
-    summaries are combined into the final brochure.
+def _input_token_budget() -> int:
+    """Tokens of website text one brochure call can take.
+
+    The model's context window, minus the output reserved for the brochure
+    and the prompt around the text.
     """
-    llm = _get_llm()
+    context = settings.llm_context_tokens or _MODEL_CONTEXT_TOKENS.get(
+        settings.gemini_model, _DEFAULT_CONTEXT_TOKENS
+    )
+    prompt = estimate_tokens(len(_BROCHURE_SYSTEM_PROMPT) + len(_FINAL_BROCHURE_PROMPT))
+    return max(1, context - settings.llm_output_tokens - prompt)
+
+
+def _chunk_size() -> int:
+    """Map-phase chunk size in characters (never more than one call can take)."""
+    tokens = min(settings.llm_map_chunk_tokens, _input_token_budget())
+    return max(_CHUNK_OVERLAP * 2, int(tokens * _CHARS_PER_TOKEN))
+
+
+def _split_text(cleaned_text: str) -> list[str]:
+    """Split cleaned text into map-phase chunks and log the plan.
+
+    Text that fits the model's input token budget is returned whole — one
+    LLM call.  Otherwise its page sections (as joined by
+    ``combine_and_clean``) are packed into as few chunks as the chunk size
+    allows by :class:`ChunkPacker`, so chunk boundaries fall on page
+    boundaries and editing one page leaves the chunks — and cached
+    summaries — of the pages before it untouched.
+    """
+    tokens = estimate_tokens(len(cleaned_text))
+    if not needs_map_reduce(len(cleaned_text)):
+        logger.info(
+            "Chunk plan: single call — ~%d tokens (budget %d)", tokens, _input_token_budget()
+        )
+        metrics.chunk_count.observe(1)
+        return [cleaned_text] if cleaned_text else []
+
+    packer = ChunkPacker()
+    chunks: list[str] = []
+    for section in cleaned_text.split(PAGE_SEPARATOR):
+        chunks.extend(packer.add(section))
+    chunks.extend(packer.finish())
+    logger.info(
+        "Chunk plan: map-reduce — %d chunk(s), ~%d tokens (budget %d)",
+        len(chunks), tokens, _input_token_budget(),
+    )
+    metrics.chunk_count.observe(len(chunks))
+    return chunks
+
+
+class ChunkPacker:
+    """Packs page sections, in document order, into map-phase chunks.
+
+    Whole sections are joined (with ``PAGE_SEPARATOR``) into one chunk for
+    as long as it stays within ``_chunk_size()`` characters; only a section
+    that alone exceeds that is split, into chunks of its own.  The same
+    sections in the same order always give the same chunks, so the
+    pipeline can summarise each chunk as soon as :meth:`add` closes it.
+    """
+
+    def __init__(self) -> None:
+        self.size = _chunk_size()
+        self._sections: list[str] = []  # the open chunk
+        self._length = 0
+
+    def add(self, section: str) -> list[str]:
+        """Add the next section; return the chunks this closed."""
+        closed: list[str] = []
+        if self._sections and self._length + len(PAGE_SEPARATOR) + len(section) > self.size:
+            closed.extend(self.finish())
+        if len(section) > self.size:
+            closed.extend(_split_section(section))
+        elif self._sections:
+            self._sections.append(section)
+            self._length += len(PAGE_SEPARATOR) + len(section)
+        else:
+            self._sections, self._length = [section], len(section)
+        return closed
+
+    def finish(self) -> list[str]:
+        """Close the open chunk, if any, and return it."""
+        if not self._sections:
+            return []
+        chunk = PAGE_SEPARATOR.join(self._sections)
+        self._sections, self._length = [], 0
+        return [chunk]
+
+
+def _split_section(section: str) -> list[str]:
+    """Split one section too large for a single chunk."""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
     splitter = RecursiveCharacterTextSplitter(
-        chunk_size=_CHUNK_SIZE,
+        chunk_size=_chunk_size(),
         chunk_overlap=_CHUNK_OVERLAP,
     )
+    return splitter.split_text(section)
 
-    chunks = splitter.split_text(cleaned_text)
-    logger.info("Split content into %d chunk(s)", len(chunks))
 
-    if len(chunks) <= 1:
-        # Single chunk — generate directly
-        text_block = chunks[0] if chunks else cleaned_text
-        messages = [
-            ("system", _BROCHURE_SYSTEM_PROMPT),
-            ("human", _FINAL_BROCHURE_PROMPT.format(text=text_block)),
-        ]
-        response = llm.invoke(messages)
-        return _extract_text(response)
+def needs_map_reduce(text_length: int) -> bool:
+    """Whether cleaned text of ``text_length`` characters takes the map-reduce path."""
+    return estimate_tokens(text_length) > _input_token_budget()
 
-    # Map phase: summarise each chunk
-    summaries: list[str] = []
-    for i, chunk in enumerate(chunks):
-        logger.info("Summarising chunk %d/%d", i + 1, len(chunks))
-        messages = [
-            ("system", "You are a helpful assistant that summarizes text accurately."),
-            ("human", _SUMMARY_PROMPT.format(text=chunk)),
-        ]
-        resp = llm.invoke(messages)
-        summaries.append(_extract_text(resp))
 
-    # Reduce phase: combine summaries into brochure
-    combined_summary = "\n\n---\n\n".join(summaries)
-    messages = [
-        ("system", _BROCHURE_SYSTEM_PROMPT),
-        ("human", _FINAL_BROCHURE_PROMPT.format(text=combined_summary)),
-    ]
-    response = llm.invoke(messages)
-    return _extract_text(response)
+# ---------------------------------------------------------------------------
+# Chunk summary cache
+# ---------------------------------------------------------------------------
+
+# Identifies the summary prompt + model: editing either prompt or switching
+# model changes every key, so stale summaries are never reused.
+_SUMMARY_PROMPT_HASH = hashlib.sha256(
+    (_SUMMARY_SYSTEM_PROMPT + _SUMMARY_PROMPT).encode("utf-8")
+).hexdigest()[:16]
+
+
+@cache
+def _get_summary_cache() -> DiskCache | None:
+    """Return the process-wide chunk summary cache, or ``None`` when disabled."""
+    if not settings.summary_cache_enabled:
+        return None
+    return DiskCache(
+        Path(settings.cache_dir) / "summaries",
+        ttl_seconds=settings.summary_cache_ttl_seconds,
+        max_bytes=settings.summary_cache_max_bytes,
+    )
+
+
+def _summary_cache_key(chunk: str) -> str:
+    chunk_hash = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+    return f"summary:{chunk_hash}:{settings.gemini_model}:{_TEMPERATURE}:{_SUMMARY_PROMPT_HASH}"
+
+
+class _StreamStats:
+    """Records a brochure stream's time to first token and token rate."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.first_token_at: float | None = None
+        self.chars = 0
+
+    def token(self, token: str) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+            metrics.llm_first_token_seconds.observe(self.first_token_at - self.started)
+        self.chars += len(token)
+
+    def finish(self) -> None:
+        if self.first_token_at is None:
+            return
+        elapsed = time.perf_counter() - self.first_token_at
+        if elapsed > 0:
+            metrics.llm_tokens_per_second.observe(estimate_tokens(self.chars) / elapsed)
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Detect transient / server errors worth retrying."""
+    exc_str = str(exc).lower()
+    return any(
+        kw in exc_str
+        for kw in ("503", "unavailable", "overloaded", "capacity", "high demand")
+    )
 
 
 # ---------------------------------------------------------------------------
-# Streaming variant – yields token chunks as they arrive from the LLM
+# Streaming generation – async-native, no worker threads, async backoff
 # ---------------------------------------------------------------------------
 
-def generate_brochure_stream(cleaned_text: str) -> Generator[str, None, None]:
+async def agenerate_brochure_stream(
+    cleaned_text: str,
+    on_progress: ProgressCallback | None = None,
+    known_summaries: Mapping[str, str] | None = None,
+    on_summary: SummaryCallback | None = None,
+) -> AsyncGenerator[str, None]:
     """Yield brochure tokens as they arrive from the LLM.
 
     For single-chunk content the entire generation streams.  For multi-chunk
     (map-reduce) content the per-chunk summaries are generated non-streamed
-    (they are intermediate work) and only the **final reduce** call streams.
+    (they are intermediate work, run concurrently and reported through
+    ``on_progress``; chunks in ``known_summaries`` are reused) and only the
+    final reduce call streams.  A cached brochure is replayed instead.
+
+    Uses the model's ``ainvoke`` / ``astream`` so a generation holds no
+    thread while it waits on the network.  ``on_progress`` and
+    ``on_summary`` are called on the event loop as each chunk summary
+    completes.
     """
-    llm = _get_llm()
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=_CHUNK_SIZE,
-        chunk_overlap=_CHUNK_OVERLAP,
-    )
+    cached = _get_cached_brochure(cleaned_text)
+    if cached is not None:
+        for piece in _replay(cached):
+            yield piece
+        return
 
-    chunks = splitter.split_text(cleaned_text)
-    logger.info("Split content into %d chunk(s) [streaming]", len(chunks))
+    llm = _get_llm()
+    chunks = _split_text(cleaned_text)
 
     if len(chunks) <= 1:
         text_block = chunks[0] if chunks else cleaned_text
-        messages = [
-            ("system", _BROCHURE_SYSTEM_PROMPT),
-            ("human", _FINAL_BROCHURE_PROMPT.format(text=text_block)),
-        ]
-        yield from _stream_llm(llm, messages)
-        return
+    else:
+        # Map phase (non-streamed – intermediate summaries, run concurrently)
+        summaries = await _asummarise_chunks(
+            llm,
+            chunks,
+            on_progress=on_progress,
+            known_summaries=known_summaries,
+            on_summary=on_summary,
+        )
+        text_block = "\n\n---\n\n".join(summaries)
 
-    # Map phase (non-streamed – intermediate summaries)
-    summaries: list[str] = []
-    for i, chunk in enumerate(chunks):
-        logger.info("Summarising chunk %d/%d [streaming]", i + 1, len(chunks))
-        messages = [
-            ("system", "You are a helpful assistant that summarizes text accurately."),
-            ("human", _SUMMARY_PROMPT.format(text=chunk)),
-        ]
-        resp = llm.invoke(messages)
-        summaries.append(_extract_text(resp))
-
-    # Reduce phase (streamed)
-    combined_summary = "\n\n---\n\n".join(summaries)
     messages = [
         ("system", _BROCHURE_SYSTEM_PROMPT),
-        ("human", _FINAL_BROCHURE_PROMPT.format(text=combined_summary)),
+        ("human", _FINAL_BROCHURE_PROMPT.format(text=text_block)),
     ]
-    yield from _stream_llm(llm, messages)
+    tokens: list[str] = []
+    async for token in _astream_llm(llm, messages):
+        tokens.append(token)
+        yield token
+    # Only reached when the stream completed without error
+    _store_brochure(cleaned_text, "".join(tokens))
+
+
+async def apresummarise_chunks(chunks: list[str]) -> dict[str, str]:
+    """Summarise chunks closed by a :class:`ChunkPacker` ahead of the map phase.
+
+    Lets the pipeline start map-phase work on pages that are already cleaned
+    while others are still downloading.  Returns ``{chunk: summary}`` — the
+    same chunks ``_split_text`` will produce — to be passed back as
+    ``known_summaries``.  Only worth calling once ``needs_map_reduce`` is
+    certain for the full text.
+    """
+    return dict(zip(chunks, await _asummarise_chunks(_get_llm(), chunks)))
+
 
+async def _asummarise_chunks(
+    llm: "ChatGoogleGenerativeAI",
+    chunks: list[str],
+    *,
+    on_progress: ProgressCallback | None = None,
+    known_summaries: Mapping[str, str] | None = None,
+    on_summary: SummaryCallback | None = None,
+) -> list[str]:
+    """Summarise every chunk, at most ``settings.llm_map_concurrency`` at once.
+
+    Summaries are returned in chunk order regardless of completion order.
+    Chunks found in ``known_summaries`` or the summary cache are not sent to
+    the LLM.  Each request also holds a process-wide ``stage_limits.llm``
+    slot.  ``on_progress(done, total)`` runs after each summary, and
+    ``on_summary(chunk, summary)`` for each one the LLM produces.
+    """
+    total = len(chunks)
+    summaries: list[str] = [""] * total
+    summary_cache = _get_summary_cache()
+    known_summaries = known_summaries or {}
 
-def _stream_llm(
-    llm: ChatGoogleGenerativeAI,
+    pending: dict[int, str] = {}
+    for i, chunk in enumerate(chunks):
+        cached = known_summaries.get(chunk)
+        if cached is None and summary_cache is not None:
+            cached = summary_cache.get(_summary_cache_key(chunk))
+        if cached is None:
+            pending[i] = chunk
+        else:
+            summaries[i] = cached
+
+    done = total - len(pending)
+    if done:
+        logger.info("Reusing %d/%d known or cached chunk summaries", done, total)
+        if on_progress is not None:
+            on_progress(done, total)
+    if not pending:
+        return summaries
+
+    slots = asyncio.Semaphore(max(1, settings.llm_map_concurrency))
+
+    async def _summarise(i: int) -> int:
+        messages = [
+            ("system", _SUMMARY_SYSTEM_PROMPT),
+            ("human", _SUMMARY_PROMPT.format(text=pending[i])),
+        ]
+        async with slots, stage_limits.llm:
+            summaries[i] = _extract_text(await llm.ainvoke(messages))
+        return i
+
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(_summarise(i)) for i in pending]
+    try:
+        for done, next_done in enumerate(asyncio.as_completed(tasks), start=done + 1):
+            i = await next_done
+            if summary_cache is not None:
+                summary_cache.set(_summary_cache_key(chunks[i]), summaries[i])
+            if on_summary is not None:
+                on_summary(chunks[i], summaries[i])
+            logger.info("Summarised chunk %d/%d", done, total)
+            if on_progress is not None:
+                on_progress(done, total)
+    except BaseException:
+        # Don't leave summaries running that nobody will use
+        for task in tasks:
+            task.cancel()
+        raise
+
+    metrics.map_seconds.observe(time.perf_counter() - started)
+    return summaries
+
+
+async def _astream_llm(
+    llm: "ChatGoogleGenerativeAI",
     messages: list,
     *,
     max_retries: int = 3,
     base_delay: float = 2.0,
-) -> Generator[str, None, None]:
-    """Call ``llm.stream()`` and yield text fragments.
+) -> AsyncGenerator[str, None]:
+    """Call ``llm.astream()`` and yield text fragments.
 
     Retries on transient server errors (5xx / UNAVAILABLE) with
-    exponential backoff.
+    exponential ``asyncio.sleep`` backoff, as long as nothing has been
+    yielded yet — a retry after partial output would repeat text the
+    caller already has.
+
+    Each attempt holds a process-wide ``stage_limits.llm`` slot for as long
+    as its Gemini request is open (not during the backoff sleep), so the
+    limit caps concurrent requests.  A slow consumer is handled upstream by
+    the pipeline's bounded token queue.
     """
-    import time
-
+    stats = _StreamStats()
     for attempt in range(1, max_retries + 1):
+        emitted = False
         try:
-            for chunk in llm.stream(messages):
-                token = _extract_text(chunk)
-                if token:
-                    yield token
+            async with stage_limits.llm:
+                async for chunk in llm.astream(messages):
+                    token = _extract_text(chunk)
+                    if token:
+                        emitted = True
+                        stats.token(token)
+                        yield token
+            stats.finish()
             return  # success — exit retry loop
         except Exception as exc:
-            # Detect transient / server errors worth retrying
-            exc_str = str(exc).lower()
-            is_transient = any(
-                kw in exc_str
-                for kw in ("503", "unavailable", "overloaded", "capacity", "high demand")
-            )
-            if is_transient and attempt < max_retries:
+            if _is_transient(exc) and not emitted and attempt < max_retries:
                 delay = base_delay * (2 ** (attempt - 1))
                 logger.warning(
                     "LLM stream attempt %d/%d failed (transient): %s — retrying in %.1fs",
                     attempt, max_retries, exc, delay,
                 )
-                time.sleep(delay)
+                await asyncio.sleep(delay)
                 continue
             # Non-transient or final attempt — propagate
             raise
+
+
+# ---------------------------------------------------------------------------
+# Blocking entry point – for scripts and notebooks
+# ---------------------------------------------------------------------------
+
+def generate_brochure(cleaned_text: str, on_progress: ProgressCallback | None = None) -> str:
+    """Generate a Markdown brochure from cleaned website text, blocking.
+
+    A thin wrapper that collects :func:`agenerate_brochure_stream`; when
+    called from a running event loop (e.g. a Jupyter cell) the generation
+    runs on a worker thread with its own loop.
+    """
+
+    async def _collect() -> str:
+        return "".join(
+            [token async for token in agenerate_brochure_stream(cleaned_text, on_progress)]
+        )
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_collect())
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, _collect()).result()
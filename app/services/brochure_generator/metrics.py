@@ -0,0 +1,87 @@
+"""Pipeline metrics, served by ``GET /api/metrics``.
+
+Histograms are recorded where the work happens (scraper, cleaner,
+summarizer, pipeline); gauges read the pipeline, the admission controller,
+the batch runner and the job manager when the endpoint is scraped.
+"""
+
+from app.services.brochure_generator.admission import admission
+from app.utilities.metrics import registry
+
+fetch_seconds = registry.histogram(
+    "brochure_fetch_seconds",
+    "Time to fetch one page (main or related), including HTTP-cache hits.",
+)
+clean_seconds = registry.histogram(
+    "brochure_clean_seconds",
+    "Time to extract the text of one page.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+chunk_count = registry.histogram(
+    "brochure_chunk_count",
+    "Map-phase chunks per brochure generation (1 = single call).",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+map_seconds = registry.histogram(
+    "brochure_map_seconds",
+    "Time to summarise the chunks of one generation that were not known or cached.",
+)
+llm_first_token_seconds = registry.histogram(
+    "brochure_llm_first_token_seconds",
+    "Time from starting the brochure stream to its first token, retries included.",
+)
+llm_tokens_per_second = registry.histogram(
+    "brochure_llm_tokens_per_second",
+    "Estimated output tokens per second of a brochure stream after its first token.",
+    buckets=(5, 10, 25, 50, 100, 200, 400, 800, 1600),
+)
+pipeline_seconds = registry.histogram(
+    "brochure_pipeline_seconds",
+    "Total time of one successful pipeline run, from the first stage to the last token.",
+    buckets=(1.0, 2.5, 5.0, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0, 300.0),
+)
+pipeline_runs = registry.counter(
+    "brochure_pipeline_runs",
+    "Finished pipeline runs by outcome (success, error, cancelled).",
+    labelnames=("outcome",),
+)
+
+
+def _pipelines_running() -> int:
+    from app.services.brochure_generator.task_manager import running_pipelines
+
+    return running_pipelines()
+
+
+def _batch_items_queued() -> int:
+    from app.services.brochure_generator.batch import batch_runner
+
+    return batch_runner.queued
+
+
+def _jobs_running() -> int:
+    from app.services.brochure_generator.jobs import job_manager
+
+    return job_manager.running
+
+
+registry.gauge(
+    "brochure_pipelines_active",
+    "Pipeline runs currently executing (interactive, job and batch).",
+    _pipelines_running,
+)
+registry.gauge(
+    "brochure_pipelines_queued",
+    "Pipeline runs waiting in the admission queue.",
+    lambda: admission.queued,
+)
+registry.gauge(
+    "brochure_batch_items_queued",
+    "Batch items waiting for a batch worker.",
+    _batch_items_queued,
+)
+registry.gauge(
+    "brochure_jobs_running",
+    "Background jobs running in this process.",
+    _jobs_running,
+)
@@ -2,48 +2,126 @@
 
 Steps handled here:
   1. Scrape main page & extract internal links
-  2. Filter related links (about, services, etc.)
-  3. Scrape related pages
+  2. Rank related links (about, services, etc.) and keep the best few
+  3. Scrape related pages (sequentially, or concurrently with global /
+     per-host limits and an overall deadline)
 """
 
+import asyncio
+import heapq
 import logging
+import re
+import time
+from collections.abc import AsyncIterator
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING
 from urllib.parse import urljoin, urlparse
 
+import lxml.html
 import tldextract
-from scrapling.fetchers import Fetcher
+from lxml import etree
+
+from app.services.brochure_generator import metrics
+from app.services.brochure_generator.admission import stage_limits
+from app.services.brochure_generator.http_cache import FetchedPage, get_http_cache
+from config.settings import settings
+
+if TYPE_CHECKING:
+    from scrapling.fetchers import Fetcher
 
 logger = logging.getLogger("app.scraper")
 
-# Keywords that indicate a page worth including in the brochure
-_RELEVANT_KEYWORDS: set[str] = {
-    "about",
-    "service",
-    "services",
-    "product",
-    "products",
-    "solution",
-    "solutions",
-    "feature",
-    "features",
-    "pricing",
-    "team",
-    "blog",
-    "contact",
-    "portfolio",
-    "company",
-    "who-we-are",
-    "what-we-do",
-    "our-work",
-    "careers",
-    "clients",
-    "customers",
-    "case-study",
-    "case-studies",
-    "testimonials",
+# Path keywords that indicate a page worth including in the brochure, with how
+# much each is worth: core company pages first, hiring and blog pages last.
+_KEYWORD_WEIGHTS: dict[str, float] = {
+    "about": 10,
+    "company": 9,
+    "who-we-are": 9,
+    "what-we-do": 9,
+    "service": 9,
+    "services": 9,
+    "product": 8,
+    "products": 8,
+    "solution": 8,
+    "solutions": 8,
+    "pricing": 8,
+    "feature": 7,
+    "features": 7,
+    "contact": 7,
+    "portfolio": 6,
+    "our-work": 6,
+    "clients": 6,
+    "customers": 6,
+    "case-study": 6,
+    "case-studies": 6,
+    "testimonials": 5,
+    "team": 5,
+    "careers": 2,
+    "blog": 1,
 }
 
+# One pass over the path finds every keyword (longest alternatives first, so
+# "services" wins over "service" at the same position).
+_KEYWORD_PATTERN = re.compile(
+    "|".join(re.escape(kw) for kw in sorted(_KEYWORD_WEIGHTS, key=len, reverse=True))
+)
+
+# Each path segment beyond the first multiplies the score by this factor:
+# /services beats /services/web/seo beats /blog/2024/05/our-services.
+_DEPTH_DECAY = 0.7
+
+_SKIPPED_EXTENSIONS = (".pdf", ".jpg", ".png", ".zip", ".css", ".js")
+
 _MAX_RELATED_PAGES = 10
 
+_FETCH_TIMEOUT = 30
+
+
+@cache
+def _fetcher() -> "type[Fetcher]":
+    """The scrapling fetcher, imported on first use rather than at startup."""
+    from scrapling.fetchers import Fetcher
+
+    return Fetcher
+
+
+def preload() -> None:
+    """Import scrapling now instead of on the first fetch."""
+    _fetcher()
+
+
+def _fetch(url: str, headers: dict[str, str] | None = None) -> FetchedPage:
+    """Perform one network fetch of *url* (``headers`` are sent as-is)."""
+    page = _fetcher().get(url, stealthy_headers=True, timeout=_FETCH_TIMEOUT, headers=headers or {})
+    raw_html = page.html_content if hasattr(page, "html_content") else str(page)
+    return FetchedPage(
+        status=getattr(page, "status", 200),
+        html=raw_html,
+        headers=dict(getattr(page, "headers", None) or {}),
+    )
+
+
+def _fetch_html(url: str) -> str:
+    """Return the raw HTML of *url*, through the HTTP cache when enabled."""
+    started = time.perf_counter()
+    try:
+        http_cache = get_http_cache()
+        if http_cache is None:
+            return _fetch(url).html
+        return http_cache.fetch(url, _fetch)
+    finally:
+        metrics.fetch_seconds.observe(time.perf_counter() - started)
+
+
+def _extract_links(html: str) -> list[str]:
+    """Return every ``<a href>`` value in *html*, in document order."""
+    if not html.strip():
+        return []
+    try:
+        return lxml.html.fromstring(html).xpath("//a/@href")
+    except (etree.ParserError, ValueError):
+        return []
+
 
 # ---------------------------------------------------------------------------
 # Step 1 – Scrape main page
@@ -52,13 +130,12 @@ _MAX_RELATED_PAGES = 10
 def scrape_main_page(url: str) -> tuple[str, list[str]]:
     """Fetch the main page and return (raw_html, list_of_href_links)."""
     logger.info("Fetching main page: %s", url)
-    page = Fetcher.get(url, stealthy_headers=True, timeout=30)
 
-    # Raw HTML for later cleaning
-    raw_html: str = page.html_content if hasattr(page, "html_content") else str(page)
+    # Raw HTML for later cleaning (possibly served from the HTTP cache)
+    raw_html = _fetch_html(url)
 
     # Extract all href values
-    raw_links: list[str] = page.css("a::attr(href)").getall()
+    raw_links = _extract_links(raw_html)
 
     # Resolve relative URLs
     absolute_links = [urljoin(url, link) for link in raw_links if link]
@@ -71,45 +148,57 @@ def scrape_main_page(url: str) -> tuple[str, list[str]]:
 # Step 2 – Filter related links
 # ---------------------------------------------------------------------------
 
-def filter_related_links(base_url: str, links: list[str]) -> list[str]:
-    """Keep only same-domain links whose path contains relevant keywords."""
-    base_ext = tldextract.extract(base_url)
-    base_domain = f"{base_ext.domain}.{base_ext.suffix}"
+@lru_cache(maxsize=4096)
+def _registered_domain(host: str) -> str:
+    """Registered domain of *host* (``blog.example.co.uk`` → ``example.co.uk``)."""
+    ext = tldextract.extract(host)
+    return f"{ext.domain}.{ext.suffix}"
 
-    seen: set[str] = set()
-    filtered: list[str] = []
 
-    for link in links:
-        # Normalize: strip fragment, trailing slash
-        parsed = urlparse(link)
-        normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path.rstrip('/')}"
+def _score_path(path: str) -> float:
+    """Relevance of a URL path: best keyword weight, decayed by path depth."""
+    weight = max((_KEYWORD_WEIGHTS[kw] for kw in _KEYWORD_PATTERN.findall(path)), default=0)
+    if not weight:
+        return 0.0
+    depth = max(1, sum(1 for segment in path.split("/") if segment))
+    return weight * _DEPTH_DECAY ** (depth - 1)
 
-        if normalized in seen:
-            continue
-        seen.add(normalized)
 
-        # Same domain check
-        link_ext = tldextract.extract(link)
-        link_domain = f"{link_ext.domain}.{link_ext.suffix}"
-        if link_domain != base_domain:
-            continue
+def filter_related_links(base_url: str, links: list[str], limit: int = _MAX_RELATED_PAGES) -> list[str]:
+    """Return the ``limit`` most relevant same-domain links, best first.
 
-        # Skip non-http(s), anchors-only, file downloads
+    Links are scored by the keywords in their path and how deep the path
+    is; ties keep page order.  Each host is resolved to its registered
+    domain once, however many links point at it.
+    """
+    base_domain = _registered_domain(urlparse(base_url).hostname or "")
+
+    scores: dict[str, float] = {}
+    for link in links:
+        # Normalize: strip query, fragment, trailing slash
+        parsed = urlparse(link)
         if parsed.scheme not in ("http", "https"):
             continue
-        if any(parsed.path.lower().endswith(ext) for ext in (".pdf", ".jpg", ".png", ".zip", ".css", ".js")):
+        path_lower = parsed.path.lower()
+        if path_lower.endswith(_SKIPPED_EXTENSIONS):
             continue
 
-        # Keyword relevance check
-        path_lower = parsed.path.lower()
-        if any(kw in path_lower for kw in _RELEVANT_KEYWORDS):
-            filtered.append(normalized)
+        normalized = f"{parsed.scheme}://{parsed.netloc}{parsed.path.rstrip('/')}"
+        if normalized in scores:
+            continue
 
-        if len(filtered) >= _MAX_RELATED_PAGES:
-            break
+        # Same domain check
+        if _registered_domain(parsed.hostname or "") != base_domain:
+            continue
 
-    logger.info("Filtered to %d related links", len(filtered))
-    return filtered
+        score = _score_path(path_lower)
+        if score:
+            scores[normalized] = score
+
+    # nlargest is stable, so equal scores keep their page order
+    ranked = heapq.nlargest(limit, scores, key=scores.__getitem__)
+    logger.info("Filtered to %d related links (%d candidates)", len(ranked), len(scores))
+    return ranked
 
 
 # ---------------------------------------------------------------------------
@@ -122,9 +211,94 @@ def scrape_related_pages(urls: list[str]) -> list[dict[str, str]]:
     for url in urls:
         try:
             logger.info("Fetching related page: %s", url)
-            page = Fetcher.get(url, stealthy_headers=True, timeout=30)
-            raw_html = page.html_content if hasattr(page, "html_content") else str(page)
-            results.append({"url": url, "html": raw_html})
+            results.append({"url": url, "html": _fetch_html(url)})
         except Exception as exc:
             logger.warning("Failed to fetch %s: %s", url, exc)
     return results
+
+
+async def iter_related_pages(
+    urls: list[str],
+    *,
+    max_concurrency: int | None = None,
+    per_host_limit: int | None = None,
+    deadline: float | None = None,
+) -> AsyncIterator[dict[str, str]]:
+    """Fetch related URLs concurrently and yield {url, html} as each completes.
+
+    At most ``max_concurrency`` fetches run at once, and at most
+    ``per_host_limit`` of those against the same host.  Once ``deadline``
+    seconds have elapsed the remaining fetches are abandoned, so callers get
+    whatever finished in time.  Limits default to the ``scrape_*`` settings;
+    a deadline of ``0`` disables it.  Every fetch also counts against the
+    process-wide ``stage_limits.fetch`` budget.
+    """
+    max_concurrency = max_concurrency or settings.scrape_max_concurrency
+    per_host_limit = per_host_limit or settings.scrape_per_host_concurrency
+    if deadline is None:
+        deadline = settings.scrape_deadline_seconds
+
+    global_slots = asyncio.Semaphore(max(1, max_concurrency))
+    host_slots: dict[str, asyncio.Semaphore] = {}
+
+    async def _fetch_one(url: str) -> dict[str, str]:
+        host = urlparse(url).netloc.lower()
+        host_limit = host_slots.setdefault(host, asyncio.Semaphore(max(1, per_host_limit)))
+        # Take the host slot first so a fetch queued behind its host never
+        # holds one of the global slots while it waits.
+        async with host_limit, global_slots, stage_limits.fetch:
+            logger.info("Fetching related page: %s", url)
+            html = await asyncio.to_thread(_fetch_html, url)
+        return {"url": url, "html": html}
+
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + deadline if deadline else None
+    task_urls = {asyncio.create_task(_fetch_one(url)): url for url in urls}
+    pending = set(task_urls)
+
+    try:
+        while pending:
+            timeout = None if stop_at is None else max(0.0, stop_at - loop.time())
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                logger.warning(
+                    "Related-page deadline of %.1fs reached — abandoning %d fetch(es)",
+                    deadline, len(pending),
+                )
+                break
+            for task in done:
+                exc = task.exception()
+                if exc is not None:
+                    logger.warning("Failed to fetch %s: %s", task_urls[task], exc)
+                    continue
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def scrape_related_pages_concurrent(
+    urls: list[str],
+    *,
+    max_concurrency: int | None = None,
+    per_host_limit: int | None = None,
+    deadline: float | None = None,
+) -> list[dict[str, str]]:
+    """Concurrent counterpart of :func:`scrape_related_pages`.
+
+    Returns the pages fetched before the deadline as {url, html} dicts, in
+    the same order as ``urls``.  Failed or abandoned pages are omitted.
+    """
+    fetched: dict[str, dict[str, str]] = {}
+    async for page in iter_related_pages(
+        urls,
+        max_concurrency=max_concurrency,
+        per_host_limit=per_host_limit,
+        deadline=deadline,
+    ):
+        fetched[page["url"]] = page
+
+    logger.info("Fetched %d/%d related page(s)", len(fetched), len(urls))
+    return [fetched[url] for url in urls if url in fetched]
@@ -0,0 +1,185 @@
+"""Request coalescing for the brochure pipeline.
+
+Concurrent requests for the same (normalised) URL share one run of
+``run_pipeline_stream`` instead of each scraping and generating on their own.
+Every chunk the run produces is recorded, so a subscriber that joins late
+still receives the whole stream from the first progress message.  The run
+is owned by a background task: a subscriber going away never stops it for
+the others, but once the *last* subscriber has gone the run is cancelled so
+nobody pays for pages and tokens that will never be read.
+
+A run started with a run ID (background jobs) checkpoints its stages under
+it; starting a run with the ID of an earlier, unfinished one resumes it.
+Interactive runs have no run ID and write no checkpoints.
+
+Only a request that starts a *new* run goes through admission control;
+joining a run that is already in flight is always allowed.
+"""
+
+import asyncio
+import logging
+from urllib.parse import urlsplit, urlunsplit
+
+from app.services.brochure_generator.admission import Ticket, admission
+from app.services.brochure_generator.task_manager import PipelineOutcome, run_pipeline_stream
+
+logger = logging.getLogger("app.single_flight")
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalise_url(url: str) -> str:
+    """Canonical form of ``url`` used as the coalescing key.
+
+    Lower-cases scheme and host, drops default ports, fragments and trailing
+    slashes.  The query string is kept — it can change the page.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+class _Flight:
+    """One in-flight pipeline run and the chunks it has produced so far."""
+
+    def __init__(self, key: str, url: str, ticket: Ticket, run_id: str | None) -> None:
+        self.key = key
+        self.run_id = run_id
+        self.history: list[str] = []
+        self.outcome = PipelineOutcome()
+        self.done = False
+        self.subscribers = 0
+        self._updated = asyncio.Event()
+        self.task = asyncio.create_task(self._run(url, ticket), name=f"pipeline:{key}")
+
+    def _notify(self) -> None:
+        # Wake everyone waiting on the current event, then start a new one
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    def _publish(self, chunk: str) -> None:
+        self.history.append(chunk)
+        self._notify()
+
+    async def _run(self, url: str, ticket: Ticket) -> None:
+        try:
+            async with ticket:
+                try:
+                    async for position in ticket.wait():
+                        self._publish(f"⏳ Waiting in queue (position {position})…\n\n")
+                except asyncio.CancelledError:
+                    logger.info("Pipeline run for %s cancelled while waiting in queue", self.key)
+                    raise
+                async for chunk in run_pipeline_stream(
+                    url, run_id=self.run_id, outcome=self.outcome
+                ):
+                    self._publish(chunk)
+        finally:
+            self.done = True
+            self._notify()
+            if _flights.get(self.key) is self:
+                del _flights[self.key]
+
+    def subscribe(self) -> "PipelineSubscription":
+        return PipelineSubscription(self)
+
+    def unsubscribe(self) -> None:
+        self.subscribers -= 1
+        if self.subscribers > 0 or self.done:
+            return
+        # Nobody is reading any more — stop scraping and generating
+        logger.info("All clients left — cancelling pipeline run for %s", self.key)
+        if _flights.get(self.key) is self:
+            del _flights[self.key]
+        self.task.cancel()
+
+
+class PipelineSubscription:
+    """One client's view of a shared pipeline run.
+
+    Iterate it (``async for``) to receive every chunk of the run, starting
+    from the first one.  :meth:`close` stops following the run; it is safe
+    to call from another task while an iteration is pending, and the run is
+    cancelled once no subscriber is left.
+    """
+
+    def __init__(self, flight: _Flight) -> None:
+        self._flight = flight
+        self._position = 0
+        self.closed = False
+        flight.subscribers += 1
+
+    @property
+    def run_id(self) -> str | None:
+        """ID of the run being followed — pass it back to resume the run.
+
+        ``None`` for a run started without one, which cannot be resumed.
+        """
+        return self._flight.run_id
+
+    @property
+    def outcome(self) -> PipelineOutcome:
+        """Status, error and brochure of the run; final once iteration has ended."""
+        return self._flight.outcome
+
+    def __aiter__(self) -> "PipelineSubscription":
+        return self
+
+    async def __anext__(self) -> str:
+        flight = self._flight
+        while not self.closed:
+            updated = flight._updated
+            if self._position < len(flight.history):
+                self._position += 1
+                return flight.history[self._position - 1]
+            if flight.done:
+                break
+            await updated.wait()
+        self.close()
+        raise StopAsyncIteration
+
+    def reattach(self) -> "PipelineSubscription":
+        """A new, independent subscription to the same run, from its first chunk."""
+        return PipelineSubscription(self._flight)
+
+    def close(self) -> None:
+        """Stop following the run (idempotent)."""
+        if not self.closed:
+            self.closed = True
+            self._flight.unsubscribe()
+
+    async def aclose(self) -> None:
+        self.close()
+
+
+_flights: dict[str, _Flight] = {}
+
+
+def open_pipeline_stream(url: str, *, run_id: str | None = None) -> PipelineSubscription:
+    """Join the in-flight run for ``url`` or admit a new one, without waiting.
+
+    A new run with a ``run_id`` checkpoints its stages under it, resuming
+    from any it already has; without one it is not checkpointed.  When a run
+    for ``url`` is already in flight it is joined regardless.
+
+    Returns the subscriber's stream; close it when the client goes away.  Raises
+    :class:`~app.services.brochure_generator.admission.PipelineBusyError`
+    straight away when a new run is needed but the wait queue is full, so
+    callers can reject the request before streaming anything.
+    """
+    key = normalise_url(url)
+    flight = _flights.get(key)
+    if flight is None:
+        ticket = admission.reserve()
+        flight = _flights[key] = _Flight(key, url, ticket, run_id)
+        logger.info("Started pipeline run for %s", key)
+    else:
+        logger.info(
+            "Joined in-flight pipeline run for %s (%d chunk(s) replayed, %d other subscriber(s))",
+            key, len(flight.history), flight.subscribers,
+        )
+    return flight.subscribe()
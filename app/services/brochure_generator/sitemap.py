@@ -0,0 +1,148 @@
+"""Sitemap-driven page discovery for the brochure generator.
+
+Anchors on the main page are a poor source of related pages on JS-heavy
+sites.  This module reads the site's ``robots.txt`` for ``Sitemap:`` lines
+(falling back to ``/sitemap.xml``), then walks the sitemaps — following
+sitemap indexes — and returns the page URLs they list, to be ranked by the
+same relevance filter as the anchors.
+
+Sitemaps are downloaded and parsed as a stream: each ``<url>`` element is
+discarded as soon as its ``<loc>`` is read, so a 50 MB sitemap never sits in
+memory, and reading stops once enough URLs have been collected.
+"""
+
+import logging
+import threading
+import zlib
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, nullcontext
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+from lxml import etree
+
+from config.settings import settings
+
+logger = logging.getLogger("app.sitemap")
+
+_TIMEOUT = httpx.Timeout(10.0)
+_HEADERS = {"User-Agent": f"{settings.app_name}/{settings.app_version} (+sitemap discovery)"}
+
+
+# Context manager held around each HTTP request of the walk
+RequestSlot = Callable[[], AbstractContextManager]
+
+
+class _Stopped(Exception):
+    """Raised inside the walk when the caller no longer wants results."""
+
+
+def _robots_sitemaps(client: httpx.Client, root: str, slot: RequestSlot) -> list[str]:
+    """``Sitemap:`` URLs declared in ``robots.txt``, or the conventional default."""
+    try:
+        with slot():
+            response = client.get(urljoin(root, "/robots.txt"))
+        if response.status_code == 200:
+            sitemaps = [
+                line.split(":", 1)[1].strip()
+                for line in response.text.splitlines()
+                if line.lower().startswith("sitemap:")
+            ]
+            if sitemaps:
+                return [urljoin(root, url) for url in sitemaps if url]
+    except httpx.HTTPError as exc:
+        logger.debug("robots.txt unavailable for %s: %s", root, exc)
+    return [urljoin(root, "/sitemap.xml")]
+
+
+def _iter_sitemap(
+    client: httpx.Client, url: str, stop: threading.Event | None, slot: RequestSlot
+) -> Iterator[tuple[str, str]]:
+    """Stream one sitemap and yield ``(kind, loc)`` pairs as they are parsed.
+
+    ``kind`` is ``"url"`` for a page and ``"sitemap"`` for a child sitemap of
+    a sitemap index.  Gzipped sitemaps (``*.xml.gz``) are inflated on the fly.
+    """
+    parser = etree.XMLPullParser(events=("end",), resolve_entities=False, no_network=True)
+    inflate = zlib.decompressobj(16 + zlib.MAX_WBITS) if url.endswith(".gz") else None
+
+    with slot():
+        # Waiting for the slot may have outlasted the caller's interest
+        if stop is not None and stop.is_set():
+            raise _Stopped
+        with client.stream("GET", url) as response:
+            if response.status_code != 200:
+                logger.debug("Sitemap %s returned %d", url, response.status_code)
+                return
+            for data in response.iter_bytes():
+                if stop is not None and stop.is_set():
+                    raise _Stopped
+                parser.feed(inflate.decompress(data) if inflate else data)
+                for _, element in parser.read_events():
+                    kind = etree.QName(element).localname
+                    if kind not in ("url", "sitemap"):
+                        continue
+                    loc = next(
+                        (child.text for child in element if etree.QName(child).localname == "loc"),
+                        None,
+                    )
+                    # Free everything parsed so far — only the current path stays in memory
+                    element.clear()
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+                    if loc and loc.strip():
+                        yield kind, loc.strip()
+
+
+def discover_sitemap_links(
+    base_url: str,
+    *,
+    max_urls: int | None = None,
+    max_sitemaps: int | None = None,
+    stop: threading.Event | None = None,
+    request_slot: RequestSlot | None = None,
+) -> list[str]:
+    """Return page URLs listed in the sitemaps of ``base_url``'s site.
+
+    At most ``max_urls`` URLs (``settings.sitemap_max_urls``) are collected
+    from at most ``max_sitemaps`` sitemap files (``settings.sitemap_max_files``).
+    Setting ``stop`` abandons the walk and returns what was found so far.
+    ``request_slot``, if given, is entered around each HTTP request (the
+    ``robots.txt`` lookup and every sitemap download) and left in between.
+    Network and XML errors are logged; discovery never fails the pipeline.
+    """
+    max_urls = max_urls or settings.sitemap_max_urls
+    max_sitemaps = max_sitemaps or settings.sitemap_max_files
+    slot = request_slot or nullcontext
+
+    parts = urlsplit(base_url)
+    root = f"{parts.scheme}://{parts.netloc}/"
+    urls: list[str] = []
+
+    with httpx.Client(timeout=_TIMEOUT, headers=_HEADERS, follow_redirects=True) as client:
+        pending = deque(_robots_sitemaps(client, root, slot))
+        visited: set[str] = set()
+
+        while pending and len(visited) < max_sitemaps and len(urls) < max_urls:
+            sitemap_url = pending.popleft()
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+            try:
+                for kind, loc in _iter_sitemap(client, sitemap_url, stop, slot):
+                    if kind == "sitemap":
+                        pending.append(loc)
+                        continue
+                    urls.append(loc)
+                    if len(urls) >= max_urls:
+                        break
+            except _Stopped:
+                break
+            except (httpx.HTTPError, etree.XMLSyntaxError, zlib.error) as exc:
+                logger.warning("Skipping sitemap %s: %s", sitemap_url, exc)
+
+    logger.info(
+        "Discovered %d URL(s) from %d sitemap(s) of %s", len(urls), len(visited), root
+    )
+    return urls
@@ -4,85 +4,463 @@ Exposes a single ``run_pipeline_stream`` async generator that yields:
   • Stage-progress messages  (e.g. "🔍 Scraping main page…")
   • LLM token chunks         (the actual brochure text, streamed)
   • Error messages            (prefixed with "❌")
+
+With ``pipeline_mode = "pipelined"`` (the default) the scrape and clean
+stages overlap: each page is cleaned as soon as its HTML arrives, and once
+the site is known to need map-reduce, chunk summaries start while other
+pages are still downloading.  ``"staged"`` runs each stage to completion
+before the next one starts.
+
+Cancelling the task that iterates the stream (the last client went away)
+cancels pending page fetches, chunk summaries and the LLM stream, and logs
+the stage that was interrupted.
+
+Runs given a ``run_id`` (background jobs) checkpoint each stage's output
+(:mod:`~app.services.brochure_generator.checkpoints`): restarting a failed or
+cancelled run with the same ID skips the stages it already finished.  Runs
+without one write no checkpoints.
 """
 
 import asyncio
 import logging
-from collections.abc import AsyncGenerator
+import threading
+import time
+from collections.abc import AsyncGenerator, Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass, field
+
+from app.services.brochure_generator import metrics
+from app.services.brochure_generator.admission import stage_limits
+from config.settings import settings
 
 logger = logging.getLogger("app.task_manager")
 
+# Runs of run_pipeline_stream executing right now, whoever started them
+_running = 0
+
+
+@dataclass
+class PipelineOutcome:
+    """How a run of :func:`run_pipeline_stream` went, filled in as it streams.
+
+    Lets a caller tell the brochure and a failure apart from the progress
+    messages without parsing the streamed text.
+    """
+
+    status: str = "running"  # "running", "done" or "failed"
+    brochure: list[str] = field(default_factory=list)  # the brochure chunks yielded so far
+    error: str | None = None
+
+
+async def _scrape_and_clean_pipelined(
+    html: str, related_urls: list[str]
+) -> tuple[str, dict[str, str]]:
+    """Fetch related pages and clean each one as soon as it arrives.
+
+    Main-page cleaning starts immediately, overlapping the related-page
+    downloads.  A page is deduplicated as soon as every page before it (in
+    document order) is cleaned and then packed into map-phase chunks.  Once
+    the text accepted so far is too long for a single LLM call, every chunk
+    the packer has closed is also pre-summarised in the background — so no
+    summary is spent on text that deduplication removes, and the last, open
+    chunk is left to the map phase.
+
+    Returns the combined cleaned text — identical to ``combine_and_clean``
+    on the same pages — and the ``{chunk: summary}`` map computed ahead of
+    the map phase.
+    """
+    from app.services.brochure_generator.scraper import iter_related_pages
+    from app.services.brochure_generator.content_cleaner import (
+        PAGE_SEPARATOR,
+        extract_text,
+        format_section,
+        join_pages,
+    )
+    from app.services.brochure_generator.deduplicator import PageDeduplicator
+    from app.services.brochure_generator.llm_summarizer import (
+        ChunkPacker,
+        apresummarise_chunks,
+        needs_map_reduce,
+    )
+
+    order: list[str | None] = [None, *related_urls]  # document order; None is the main page
+    cleaned: dict[int, str] = {}  # cleaned texts not yet accepted, by position
+    pages: list[tuple[str | None, str]] = []  # accepted (deduplicated) pages, in order
+    deduplicator = PageDeduplicator() if settings.dedup_enabled else None
+    section_count = 0
+    section_chars = 0
+    packer = ChunkPacker()
+    unsummarised: list[str] = []  # closed chunks, held until map-reduce is certain
+    presummaries: list[asyncio.Task[dict[str, str]]] = []
+
+    def _accept_ready() -> None:
+        """Deduplicate every page whose predecessors are all accepted."""
+        nonlocal section_count, section_chars
+        while len(pages) in cleaned:
+            url = order[len(pages)]
+            text = cleaned.pop(len(pages))
+            if deduplicator is not None:
+                text = deduplicator.add(url, text)
+            pages.append((url, text))
+            if not text:
+                continue
+
+            section = format_section(text, url)
+            unsummarised.extend(packer.add(section))
+            section_count += 1
+            section_chars += len(section)
+            combined_length = section_chars + len(PAGE_SEPARATOR) * (section_count - 1)
+            if unsummarised and needs_map_reduce(combined_length):
+                presummaries.append(asyncio.create_task(apresummarise_chunks(unsummarised[:])))
+                unsummarised.clear()
+
+    async def _clean(position: int, page_html: str) -> None:
+        cleaned[position] = await extract_text(page_html)
+        _accept_ready()
+
+    positions = {url: position for position, url in enumerate(order)}
+    clean_tasks = [asyncio.create_task(_clean(0, html))]
+    try:
+        async for page in iter_related_pages(related_urls):
+            clean_tasks.append(asyncio.create_task(_clean(positions[page["url"]], page["html"])))
+        await asyncio.gather(*clean_tasks)
+
+        # Pages that were never fetched count as empty
+        for position in range(len(pages), len(order)):
+            cleaned.setdefault(position, "")
+        _accept_ready()
+    except BaseException:
+        for task in [*clean_tasks, *presummaries]:
+            task.cancel()
+        raise
+
+    if deduplicator is not None:
+        deduplicator.log_summary()
+    cleaned_text = join_pages(pages)
+
+    known_summaries: dict[str, str] = {}
+    for result in await asyncio.gather(*presummaries, return_exceptions=True):
+        if isinstance(result, BaseException):
+            # Not fatal — the map phase simply summarises those chunks itself
+            logger.warning("Early chunk summary failed: %s", result)
+        else:
+            known_summaries.update(result)
+    if presummaries:
+        logger.info(
+            "Streaming pipeline – %d chunk summary(ies) computed during scraping",
+            len(known_summaries),
+        )
+
+    return cleaned_text, known_summaries
+
+
+async def _discover_sitemap_links(url: str, stop: threading.Event) -> list[str]:
+    """Sitemap discovery for ``url``'s site, run off the event loop.
+
+    Errors are logged and yield no links — discovery only ever adds pages.
+    """
+    from app.services.brochure_generator.sitemap import discover_sitemap_links
 
-async def run_pipeline_stream(url: str) -> AsyncGenerator[str, None]:
+    # Each robots.txt / sitemap request takes its own fetch slot
+    fetch_slot = _thread_slot(stage_limits.fetch, asyncio.get_running_loop())
+    try:
+        return await asyncio.to_thread(
+            discover_sitemap_links, url, stop=stop, request_slot=fetch_slot
+        )
+    except Exception as exc:
+        logger.warning("Sitemap discovery failed for %s: %s", url, exc)
+        return []
+
+
+def _thread_slot(
+    semaphore: asyncio.Semaphore, loop: asyncio.AbstractEventLoop
+) -> Callable[[], AbstractContextManager]:
+    """A context manager factory holding ``semaphore`` from a worker thread."""
+
+    @contextmanager
+    def slot() -> Iterator[None]:
+        acquired = asyncio.run_coroutine_threadsafe(semaphore.acquire(), loop)
+        try:
+            acquired.result()
+        except BaseException:
+            acquired.cancel()
+            raise
+        try:
+            yield
+        finally:
+            loop.call_soon_threadsafe(semaphore.release)
+
+    return slot
+
+
+def running_pipelines() -> int:
+    """Pipeline runs executing in this process — interactive, job and batch."""
+    return _running
+
+
+@dataclass
+class _Progress:
+    """A progress message travelling through the LLM stream's queue."""
+
+    text: str
+
+
+def preload_pipeline() -> None:
+    """Import every pipeline stage together with the libraries it defers.
+
+    Scrapling, readability-lxml and LangChain are only imported on first use
+    so the app starts serving quickly; calling this from a worker thread
+    after startup takes that one-off cost off the first request.
+    """
+    from app.services.brochure_generator import content_cleaner, llm_summarizer, scraper
+    from app.services.brochure_generator import checkpoints, sitemap  # noqa: F401
+
+    scraper.preload()
+    content_cleaner.preload()
+    llm_summarizer.preload()
+
+
+async def run_pipeline_stream(
+    url: str,
+    *,
+    progress: bool = True,
+    run_id: str | None = None,
+    outcome: PipelineOutcome | None = None,
+) -> AsyncGenerator[str, None]:
     """Execute scrape → clean → generate and **yield** results as they happen.
 
     Stage updates are yielded as progress strings.  The final brochure is
-    yielded token-by-token from the LLM.
+    yielded token-by-token from the LLM.  With ``progress=False`` only the
+    brochure text is yielded and a failure raises instead of being yielded
+    as a ``❌`` message — for callers that want the result, not a live view.
+
+    With a ``run_id`` each stage's output is checkpointed, and a run started
+    again with the same ID resumes at the first stage without a checkpoint.
+
+    ``outcome``, if given, records the brochure chunks and the final status.
     """
     from app.services.brochure_generator.scraper import (
         scrape_main_page,
         filter_related_links,
-        scrape_related_pages,
+        scrape_related_pages_concurrent,
     )
-    from app.services.brochure_generator.content_cleaner import combine_and_clean
-    from app.services.brochure_generator.llm_summarizer import generate_brochure_stream
+    from app.services.brochure_generator.content_cleaner import acombine_and_clean
+    from app.services.brochure_generator.llm_summarizer import agenerate_brochure_stream
+    from app.services.brochure_generator.checkpoints import open_checkpoint
 
+    stage = "main-page fetch"  # reported if the run is cancelled
+    stop_discovery = threading.Event()
+    discovery: asyncio.Task[list[str]] | None = None
+    checkpoint = open_checkpoint(run_id)
+    outcome = outcome if outcome is not None else PipelineOutcome()
+    started = time.perf_counter()
+    global _running
+    _running += 1
     try:
-        # --- Step 1: Scrape main page ---
-        yield "🔍 Scraping main page…\n\n"
-        logger.info("Streaming pipeline – scraping main page: %s", url)
-        html, links = await asyncio.to_thread(scrape_main_page, url)
-
-        # --- Step 2: Filter related links ---
-        yield "🔗 Filtering related links…\n\n"
-        related_urls = filter_related_links(url, links)
-        logger.info("Streaming pipeline – found %d related links", len(related_urls))
-
-        # --- Step 3: Scrape related pages ---
-        if related_urls:
-            yield f"📄 Scraping {len(related_urls)} related page(s)…\n\n"
-            related_pages = await asyncio.to_thread(scrape_related_pages, related_urls)
+        main_page = cleaned = related_pages = None
+        known_summaries: dict[str, str] = {}
+        if checkpoint is not None:
+            cleaned = await asyncio.to_thread(checkpoint.load, "cleaned")
+            if cleaned is None:
+                main_page = await asyncio.to_thread(checkpoint.load, "main_page")
+            if main_page is not None and settings.pipeline_mode == "staged":
+                related_pages = await asyncio.to_thread(checkpoint.load, "related_pages")
+            known_summaries = await asyncio.to_thread(checkpoint.load, "summaries") or {}
+            resumed_from = (
+                "cleaned content" if cleaned is not None
+                else "fetched pages" if related_pages is not None
+                else "main page" if main_page is not None
+                else None
+            )
+            if resumed_from:
+                logger.info(
+                    "Streaming pipeline – resuming run %s from %s checkpoint (%d chunk summary(ies))",
+                    run_id, resumed_from, len(known_summaries),
+                )
+                if progress:
+                    yield f"⏩ Resuming from the {resumed_from} checkpoint…\n\n"
+
+        if cleaned is not None:
+            cleaned_text = cleaned
         else:
-            yield "📄 No related pages to scrape.\n\n"
-            related_pages = []
+            if main_page is not None:
+                html, related_urls = main_page["html"], main_page["related_urls"]
+            else:
+                # --- Step 1: Scrape main page (sitemap discovery runs alongside) ---
+                if progress:
+                    yield "🔍 Scraping main page…\n\n"
+                logger.info("Streaming pipeline – scraping main page: %s", url)
+                if settings.sitemap_enabled:
+                    discovery = asyncio.create_task(_discover_sitemap_links(url, stop_discovery))
+                async with stage_limits.fetch:
+                    html, links = await asyncio.to_thread(scrape_main_page, url)
+
+                # --- Step 2: Filter related links ---
+                stage = "link filtering"
+                if progress:
+                    yield "🔗 Filtering related links…\n\n"
+                if discovery is not None:
+                    # Give a slower sitemap a short grace period, then go without it
+                    done, _ = await asyncio.wait({discovery}, timeout=settings.sitemap_wait_seconds)
+                    if done:
+                        links = links + discovery.result()
+                    else:
+                        logger.info(
+                            "Streaming pipeline – sitemap discovery too slow, continuing without it"
+                        )
+                    # Discovery is only useful before link filtering — stop
+                    # the walk so it takes no more fetch slots
+                    stop_discovery.set()
+                    discovery.cancel()
+                related_urls = filter_related_links(url, links)
+                logger.info("Streaming pipeline – found %d related links", len(related_urls))
+                if checkpoint is not None:
+                    await asyncio.to_thread(
+                        checkpoint.save, "main_page", {"html": html, "related_urls": related_urls}
+                    )
+
+            if settings.pipeline_mode == "pipelined":
+                # --- Steps 3+4: Scrape related pages, cleaning each on arrival ---
+                stage = "related-page fetch + clean"
+                if progress:
+                    if related_urls:
+                        yield f"📄 Scraping {len(related_urls)} related page(s)…\n\n"
+                    else:
+                        yield "📄 No related pages to scrape.\n\n"
+                    yield "🧹 Cleaning content…\n\n"
+                cleaned_text, presummaries = await _scrape_and_clean_pipelined(html, related_urls)
+                known_summaries.update(presummaries)
+            else:
+                if related_pages is None:
+                    # --- Step 3: Scrape related pages ---
+                    stage = "related-page fetch"
+                    if progress:
+                        if related_urls:
+                            yield f"📄 Scraping {len(related_urls)} related page(s)…\n\n"
+                        else:
+                            yield "📄 No related pages to scrape.\n\n"
+                    related_pages = (
+                        await scrape_related_pages_concurrent(related_urls) if related_urls else []
+                    )
+                    if checkpoint is not None:
+                        await asyncio.to_thread(checkpoint.save, "related_pages", related_pages)
 
-        # --- Step 4: Clean content ---
-        yield "🧹 Cleaning content…\n\n"
-        cleaned_text = await asyncio.to_thread(combine_and_clean, html, related_pages)
+                # --- Step 4: Clean content ---
+                stage = "clean"
+                if progress:
+                    yield "🧹 Cleaning content…\n\n"
+                cleaned_text = await acombine_and_clean(html, related_pages)
+
+            if checkpoint is not None:
+                await asyncio.to_thread(checkpoint.save, "cleaned", cleaned_text)
+                if known_summaries:
+                    await asyncio.to_thread(checkpoint.save, "summaries", known_summaries)
 
         # --- Step 5: Generate brochure (streamed from LLM) ---
-        yield "✨ Generating brochure…\n\n"
+        stage = "LLM generation"
+        if progress:
+            yield "✨ Generating brochure…\n\n"
         logger.info("Streaming pipeline – generating brochure via LLM (streaming)")
 
-        # Bridge the sync generator to the async world via a queue.
-        # We pass exceptions through the queue (as an _Error sentinel)
-        # so they are always retrieved — avoiding "Future exception was
-        # never retrieved" warnings.
-        queue: asyncio.Queue[str | None | Exception] = asyncio.Queue()
+        # The LLM stream runs as a producer task feeding a bounded queue,
+        # so the model can run a little ahead of a slow client but never
+        # buffers the whole brochure.  Exceptions travel through the
+        # queue so they are always retrieved by the consumer.  Each Gemini
+        # request holds a process-wide stage_limits.llm slot until it ends
+        # (in llm_summarizer); a full queue pauses the request.
+        # Progress messages share the queue, wrapped so they are never
+        # mistaken for brochure text.
+        queue: asyncio.Queue[str | _Progress | None | Exception] = asyncio.Queue(
+            maxsize=max(1, settings.llm_stream_queue_size)
+        )
 
-        def _produce() -> None:
-            """Run the sync LLM streaming generator and push chunks to the queue."""
+        def _on_progress(done: int, total: int) -> None:
+            if not progress:
+                return
             try:
-                for token in generate_brochure_stream(cleaned_text):
-                    queue.put_nowait(token)
-            except Exception as exc:
-                queue.put_nowait(exc)  # send the error to the consumer
-            finally:
-                queue.put_nowait(None)  # sentinel — always signals "done"
+                queue.put_nowait(_Progress(f"📝 Summarised {done}/{total} chunk(s)…\n\n"))
+            except asyncio.QueueFull:
+                pass  # consumer is behind — a later update supersedes this one
+
+        summaries_saved: asyncio.Task[None] | None = None
+
+        async def _save_summaries() -> None:
+            """Checkpoint the summaries off the loop, one write at a time."""
+            while True:
+                snapshot = dict(known_summaries)
+                await asyncio.to_thread(checkpoint.save, "summaries", snapshot)
+                if len(known_summaries) == len(snapshot):
+                    return  # nothing new arrived during the write
 
-        # Run the sync generator in a thread
-        asyncio.get_event_loop().run_in_executor(None, _produce)
+        def _on_summary(chunk: str, summary: str) -> None:
+            nonlocal summaries_saved
+            if checkpoint is None:
+                return
+            known_summaries[chunk] = summary
+            # Summaries arriving while a write is in flight go in its next pass
+            if summaries_saved is None or summaries_saved.done():
+                summaries_saved = asyncio.create_task(_save_summaries())
+
+        async def _produce() -> None:
+            """Run the async LLM stream and push chunks to the queue."""
+            try:
+                async for token in agenerate_brochure_stream(
+                    cleaned_text,
+                    on_progress=_on_progress,
+                    known_summaries=known_summaries,
+                    on_summary=_on_summary,
+                ):
+                    await queue.put(token)
+            except Exception as exc:
+                await queue.put(exc)  # send the error to the consumer
+                return
+            await queue.put(None)  # sentinel — signals "done"
 
-        while True:
-            item = await queue.get()
-            if item is None:
-                break
-            if isinstance(item, Exception):
-                raise item
-            yield item
+        producer = asyncio.create_task(_produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if isinstance(item, _Progress):
+                    yield item.text
+                    continue
+                outcome.brochure.append(item)
+                yield item
+        finally:
+            # Consumer gone (error, cancellation or closed stream) —
+            # cancelling the task aborts the in-flight LLM request
+            producer.cancel()
+            if summaries_saved is not None:
+                # Let the last write land (a retry resumes from it) before
+                # the run clears or keeps its checkpoint
+                await asyncio.gather(summaries_saved, return_exceptions=True)
 
         logger.info("Streaming pipeline – completed successfully")
+        metrics.pipeline_seconds.observe(time.perf_counter() - started)
+        metrics.pipeline_runs.inc(outcome="success")
+        outcome.status = "done"
+        if checkpoint is not None:
+            await asyncio.to_thread(checkpoint.clear)
 
+    except asyncio.CancelledError:
+        # Client(s) gone — pending fetches, summaries and the LLM stream are
+        # cancelled as this propagates
+        logger.warning("Streaming pipeline – cancelled during %s stage: %s", stage, url)
+        metrics.pipeline_runs.inc(outcome="cancelled")
+        raise
     except Exception as exc:
         logger.exception("Streaming pipeline – failed: %s", exc)
+        metrics.pipeline_runs.inc(outcome="error")
+        outcome.status, outcome.error = "failed", str(exc)
+        if not progress:
+            raise
         yield f"\n\n❌ Generation failed: {exc}"
+    finally:
+        _running -= 1
+        # Failed or cancelled before link filtering
+        stop_discovery.set()
+        if discovery is not None:
+            discovery.cancel()
@@ -0,0 +1,170 @@
+"""Small on-disk key/value cache shared by the services.
+
+Each entry is one JSON file named after the SHA-256 of its key.  Entries
+carry the time they were stored so callers can apply a TTL, and the store as
+a whole is bounded in bytes: when a write pushes it over ``max_bytes`` the
+least-recently-used files (by modification time, which reads refresh) are
+deleted until it fits again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("app.disk_cache")
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# After an eviction the store is trimmed to this fraction of ``max_bytes``
+# so that a full cache doesn't evict on every single write.
+_EVICT_TO_RATIO = 0.9
+
+
+def resolve_cache_dir(path: str) -> Path:
+    """Resolve a (possibly relative) cache directory against the project root."""
+    resolved = Path(path)
+    return resolved if resolved.is_absolute() else _PROJECT_ROOT / resolved
+
+
+@dataclass
+class CacheEntry:
+    """A stored value plus the wall-clock time it was written."""
+
+    value: Any
+    stored_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        """Younger than ``ttl_seconds``; a TTL of ``0`` never expires."""
+        return not ttl_seconds or self.age < ttl_seconds
+
+
+class DiskCache:
+    """Size-bounded LRU cache of JSON-serialisable values on the filesystem.
+
+    ``get`` only returns entries younger than ``ttl_seconds`` (``0`` means no
+    expiry); ``get_entry`` returns whatever is stored, however old, for
+    callers that revalidate stale data themselves.  Safe to use from several
+    threads of one process.
+    """
+
+    def __init__(self, directory: str | Path, *, ttl_seconds: float, max_bytes: int) -> None:
+        self.directory = resolve_cache_dir(str(directory))
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = sum(p.stat().st_size for p in self.directory.glob("*.json"))
+
+    # ── Lookup ──
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get_entry(self, key: str) -> CacheEntry | None:
+        """Return the stored entry for ``key`` regardless of its age."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as fh:
+                record = json.load(fh)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            return None
+        if record.get("key") != key:
+            return None
+        return CacheEntry(value=record["value"], stored_at=record["stored_at"])
+
+    def get(self, key: str) -> Any | None:
+        """Return the value for ``key`` if present and not expired."""
+        entry = self.get_entry(key)
+        fresh = entry is not None and entry.is_fresh(self.ttl_seconds)
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry.value if fresh else None
+
+    # ── Mutation ──
+
+    def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key`` (overwriting), then enforce the size bound."""
+        path = self._path(key)
+        payload = json.dumps(
+            {"key": key, "stored_at": time.time(), "value": value},
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        # Write to a temp file and rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(payload)
+            with self._lock:
+                old_size = path.stat().st_size if path.exists() else 0
+                os.replace(tmp_path, path)
+                self._size += len(payload) - old_size
+                if self._size > self.max_bytes:
+                    self._evict()
+        except OSError as exc:
+            logger.warning("Cache write failed for %s: %s", self.directory, exc)
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        with self._lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except OSError:
+                return
+            self._size -= size
+
+    def _evict(self) -> None:
+        """Delete least-recently-used entries until under the target size.
+
+        Caller must hold ``self._lock``.
+        """
+        target = self.max_bytes * _EVICT_TO_RATIO
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+
+        for _, size, path in files:
+            if self._size <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self._size -= size
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size_bytes": self._size,
+        }
@@ -0,0 +1,161 @@
+"""Minimal in-process metrics with Prometheus text exposition.
+
+Counters, histograms and callback gauges, registered on a
+:class:`MetricsRegistry` and rendered in the Prometheus text format (0.0.4)
+by :meth:`MetricsRegistry.render`.  Recording is a lock, a bisect and a few
+additions, so instrumentation can stay on in production; gauges cost nothing
+until they are scraped.  Safe to record from worker threads.
+"""
+
+import bisect
+import math
+import threading
+from collections.abc import Callable, Iterable
+
+# Default buckets for durations in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return f"{{{pairs}}}" if pairs else ""
+
+
+class Counter:
+    """Monotonic count, optionally split by the values of ``labelnames``."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        # Exposed with the conventional suffix, on the samples and HELP/TYPE alike
+        self.family = f"{name}_total"
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f"{self.family}{_format_labels(zip(self.labelnames, key))} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram:
+    """Distribution of observed values over fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, buckets: tuple[float, ...] = DURATION_BUCKETS
+    ) -> None:
+        self.name = self.family = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot: above every bucket
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, math.inf), counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{_format_value(bound)}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {_format_value(total)}")
+        lines.append(f"{self.name}_count {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Current value read from ``read`` at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, read: Callable[[], float]) -> None:
+        self.name = self.family = name
+        self.documentation = documentation
+        self._read = read
+
+    def samples(self) -> list[str]:
+        return [f"{self.name} {_format_value(self._read())}"]
+
+
+class MetricsRegistry:
+    """Named collection of metrics, rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Counter | Histogram | Gauge] = {}
+
+    def register(self, metric: "Counter | Histogram | Gauge") -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name!r} is already registered")
+        self._metrics[metric.name] = metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self, name: str, documentation: str, buckets: tuple[float, ...] = DURATION_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, buckets)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, read: Callable[[], float]) -> Gauge:
+        metric = Gauge(name, documentation, read)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format.
+
+        HELP and TYPE name the same family as the samples under them:
+
+        >>> registry = MetricsRegistry()
+        >>> registry.counter("runs", "Finished runs.", labelnames=("outcome",)).inc(outcome="ok")
+        >>> print(registry.render(), end="")
+        # HELP runs_total Finished runs.
+        # TYPE runs_total counter
+        runs_total{outcome="ok"} 1
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.family} {metric.documentation}")
+            lines.append(f"# TYPE {metric.family} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry served by GET /api/metrics
+registry = MetricsRegistry()
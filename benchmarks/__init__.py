@@ -0,0 +1,9 @@
+"""Offline benchmarks for the brochure pipeline.
+
+Everything a benchmark needs ships with it: a generated corpus of
+real-world-sized pages (:mod:`benchmarks.corpus`) served by a local stand-in
+site (:mod:`benchmarks.site_server`), and a deterministic fake chat model
+(:mod:`benchmarks.fake_llm`) — no live sites, no Gemini key.
+
+Run ``python -m benchmarks.pipeline --help`` from the project root.
+"""
@@ -0,0 +1,150 @@
+"""Deterministic fixture site for the benchmarks.
+
+:func:`build_corpus` generates a small company website — a home page
+linking to about / services / pricing / … pages plus the usual decoys
+(login, legal, assets, external profiles) — with the weight of a real one:
+inline scripts and styles in the head, large navigation and footer blocks,
+a cookie banner repeated on every page, and several kilobytes of prose per
+page.  The same arguments always produce byte-identical pages, so results
+are comparable between commits.
+"""
+
+import random
+
+# Related pages, in the order they are generated — keyword paths the link
+# ranking picks up, from core company pages to blog posts.
+_RELATED_PATHS = (
+    "/about",
+    "/services",
+    "/products",
+    "/solutions",
+    "/pricing",
+    "/features",
+    "/customers",
+    "/case-studies",
+    "/team",
+    "/contact",
+    "/careers",
+    "/blog/2024/scaling-our-platform",
+    "/blog/2024/customer-stories",
+    "/blog/2023/year-in-review",
+)
+
+# Links every page carries that must never be picked as related pages
+_DECOY_LINKS = (
+    "/login",
+    "/signup",
+    "/legal/privacy",
+    "/legal/terms",
+    "/static/brochure.pdf",
+    "/static/logo.png",
+    "https://twitter.com/acme",
+    "https://www.linkedin.com/company/acme",
+    "mailto:hello@acme.example",
+    "#top",
+)
+
+# Word pool for generated prose (and the fake model's replies)
+VOCABULARY = (
+    "platform customers teams data cloud secure reliable insight analytics "
+    "workflow automation integration enterprise growth partner global scale "
+    "service support delivery quality innovation strategy product roadmap "
+    "market industry solution performance efficiency value trusted modern "
+    "experience design engineering operations finance retail healthcare "
+    "logistics manufacturing pricing plan subscription onboarding migration "
+    "dashboard report api developer mobile web infrastructure security "
+    "compliance privacy governance team culture mission vision history "
+    "founded office remote hiring career benefit award recognition case "
+    "study result outcome revenue cost time saving launch release update "
+    "feature capability module workspace collaboration real-time forecast"
+).split()
+
+_COOKIE_BANNER = (
+    "We use cookies to improve your experience on our site, analyse traffic "
+    "and personalise content. By continuing to browse you agree to our use "
+    "of cookies as described in our privacy policy."
+)
+
+_FOOTER_BLURB = (
+    "Acme Corporation builds software that helps teams of every size work "
+    "faster and smarter. Subscribe to our newsletter for product updates, "
+    "customer stories and invitations to upcoming events."
+)
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(8, 22))]
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(3, 7)))
+
+
+def _inline_assets(rng: random.Random, size: int) -> str:
+    """Inline ``<style>`` and ``<script>`` blocks of roughly ``size`` bytes."""
+    rules = []
+    while sum(map(len, rules)) < size // 2:
+        name = rng.choice(VOCABULARY)
+        colour = rng.randrange(16**6)
+        rules.append(f".{name}-{len(rules)}{{margin:{rng.randint(0, 48)}px;color:#{colour:06x}}}")
+    statements = []
+    while sum(map(len, statements)) < size // 2:
+        name = rng.choice(VOCABULARY)
+        fallback = rng.randint(0, 999)
+        statements.append(
+            f"window.__{name}_{len(statements)}=function(e){{return e&&e.{name}||{fallback}}};"
+        )
+    return f"<style>{''.join(rules)}</style><script>{''.join(statements)}</script>"
+
+
+def _nav(paths: list[str]) -> str:
+    items = "".join(
+        f'<li><a href="{path}">{path.strip("/").title() or "Home"}</a></li>' for path in paths
+    )
+    return f"<nav><ul>{items}</ul></nav>"
+
+
+def _page(
+    rng: random.Random, title: str, nav_paths: list[str], text_kb: int, asset_kb: int
+) -> str:
+    sections = []
+    size = 0
+    while size < text_kb * 1024:
+        heading = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(2, 5))).title()
+        paragraphs = [_paragraph(rng) for _ in range(rng.randint(2, 4))]
+        size += sum(map(len, paragraphs))
+        body = "".join(f"<p>{paragraph}</p>" for paragraph in paragraphs)
+        sections.append(f"<section><h2>{heading}</h2>{body}</section>")
+
+    footer_links = "".join(f'<a href="{link}">{link}</a> ' for link in _DECOY_LINKS)
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\">"
+        f"<title>{title} | Acme</title>{_inline_assets(rng, asset_kb * 1024)}</head><body>"
+        f"<header><a href=\"/\">Acme</a>{_nav(nav_paths)}</header>"
+        f"<div class=\"cookie-banner\"><p>{_COOKIE_BANNER}</p></div>"
+        f"<main><article><h1>{title}</h1>{''.join(sections)}</article></main>"
+        f"<footer><p>{_FOOTER_BLURB}</p>{_nav(nav_paths)}<p>{footer_links}</p>"
+        "<p>© Acme Corporation. All rights reserved.</p></footer></body></html>"
+    )
+
+
+def build_corpus(
+    related_pages: int = 10,
+    *,
+    text_kb: int = 12,
+    asset_kb: int = 80,
+    seed: int = 0,
+) -> dict[str, str]:
+    """Return ``{path: html}`` for the home page (``"/"``) and its related pages.
+
+    Each page has about ``text_kb`` KB of prose and ``asset_kb`` KB of inline
+    CSS / JavaScript.  At most ``len(_RELATED_PATHS)`` related pages exist.
+    """
+    paths = list(_RELATED_PATHS[: max(0, related_pages)])
+    rng = random.Random(seed)
+    pages = {"/": _page(rng, "Acme — Software for modern teams", paths, text_kb, asset_kb)}
+    for path in paths:
+        title = path.rsplit("/", 1)[-1].replace("-", " ").title()
+        pages[path] = _page(rng, title, paths, text_kb, asset_kb)
+    return pages
@@ -0,0 +1,93 @@
+"""Deterministic stand-in for the Gemini chat model.
+
+:class:`FakeChatModel` implements the parts of the LangChain chat-model
+interface the summarizer uses (``invoke`` / ``ainvoke`` / ``stream`` /
+``astream``).  Each call waits ``latency`` seconds before its first token
+and then produces tokens at ``tokens_per_second``; replies are derived from
+a hash of the prompt, so the same input always gets the same output.
+"""
+
+import asyncio
+import hashlib
+import random
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from benchmarks.corpus import VOCABULARY
+
+
+class FakeChatModel:
+    """Chat model with configurable latency and token rate.
+
+    Map-phase calls (``invoke`` / ``ainvoke``) return ``summary_tokens``
+    tokens; streamed calls return ``output_tokens``.  ``calls`` and
+    ``tokens`` count what the model has been asked for and produced.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.3,
+        tokens_per_second: float = 200.0,
+        output_tokens: int = 800,
+        summary_tokens: int = 150,
+    ) -> None:
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.summary_tokens = summary_tokens
+        self.calls = 0
+        self.tokens = 0
+
+    def _reply(self, messages: list, count: int) -> list[str]:
+        self.calls += 1
+        self.tokens += count
+        prompt = "".join(str(content) for _, content in messages)
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+        return [f"{rng.choice(VOCABULARY)} " for _ in range(count)]
+
+    def _generation_time(self, count: int) -> float:
+        return self.latency + count / self.tokens_per_second
+
+    # ── Map phase (non-streamed) ──
+
+    def invoke(self, messages: list, **kwargs) -> AIMessage:
+        tokens = self._reply(messages, self.summary_tokens)
+        time.sleep(self._generation_time(len(tokens)))
+        return AIMessage(content="".join(tokens))
+
+    async def ainvoke(self, messages: list, **kwargs) -> AIMessage:
+        tokens = self._reply(messages, self.summary_tokens)
+        await asyncio.sleep(self._generation_time(len(tokens)))
+        return AIMessage(content="".join(tokens))
+
+    # ── Final brochure (streamed) ──
+
+    def stream(self, messages: list, **kwargs) -> Iterator[AIMessageChunk]:
+        start = time.perf_counter() + self.latency
+        for i, token in enumerate(self._reply(messages, self.output_tokens)):
+            # Pace against the start time so sleep overshoot doesn't accumulate
+            time.sleep(max(0.0, start + i / self.tokens_per_second - time.perf_counter()))
+            yield AIMessageChunk(content=token)
+
+    async def astream(self, messages: list, **kwargs) -> AsyncIterator[AIMessageChunk]:
+        start = time.perf_counter() + self.latency
+        for i, token in enumerate(self._reply(messages, self.output_tokens)):
+            await asyncio.sleep(max(0.0, start + i / self.tokens_per_second - time.perf_counter()))
+            yield AIMessageChunk(content=token)
+
+
+@contextmanager
+def use_fake_llm(model: FakeChatModel) -> Iterator[FakeChatModel]:
+    """Make the summarizer use ``model`` instead of Gemini inside the block."""
+    from app.services.brochure_generator import llm_summarizer
+
+    original = llm_summarizer._get_llm
+    llm_summarizer._get_llm = lambda: model
+    try:
+        yield model
+    finally:
+        llm_summarizer._get_llm = original
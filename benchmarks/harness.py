@@ -0,0 +1,136 @@
+"""Timing, CPU and memory measurement shared by the benchmarks."""
+
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+# A benchmark run returns counters ("pages", "bytes", "tokens", …); these
+# ones are also reported as per-second throughput.
+Counters = dict[str, float]
+_RATE_COUNTERS = ("pages", "bytes", "tokens", "records", "requests")
+
+
+@dataclass
+class StageResult:
+    """Repeated measurements of one benchmark stage."""
+
+    name: str
+    wall: list[float] = field(default_factory=list)
+    cpu: list[float] = field(default_factory=list)
+    peak_memory_bytes: int | None = None
+    counters: Counters = field(default_factory=dict)
+    extra: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        median_wall = statistics.median(self.wall)
+        return {
+            "runs": len(self.wall),
+            "wall_s": {
+                "min": min(self.wall),
+                "median": median_wall,
+                "mean": statistics.fmean(self.wall),
+                "max": max(self.wall),
+            },
+            "cpu_s": {"median": statistics.median(self.cpu)},
+            "peak_memory_bytes": self.peak_memory_bytes,
+            "counters": self.counters,
+            "throughput_per_s": {
+                name: value / median_wall if median_wall else None
+                for name, value in self.counters.items()
+                if name in _RATE_COUNTERS
+            },
+            **self.extra,
+        }
+
+
+async def measure(
+    name: str,
+    run: Callable[[], Awaitable[Counters]],
+    *,
+    repeat: int,
+    warmup: int = 1,
+    trace_memory: bool = True,
+) -> StageResult:
+    """Run ``run`` ``warmup`` + ``repeat`` times and record wall and CPU time.
+
+    CPU time is the whole process's (all threads), so it includes fetch and
+    cleaning worker threads but not worker processes.  Peak memory comes
+    from one extra run under ``tracemalloc`` (Python allocations only), kept
+    separate because tracing slows the timed runs down.  Counters are taken
+    from the last timed run.
+    """
+    result = StageResult(name)
+    for _ in range(warmup):
+        await run()
+    for _ in range(repeat):
+        gc.collect()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        result.counters = await run()
+        result.wall.append(time.perf_counter() - wall_start)
+        result.cpu.append(time.process_time() - cpu_start)
+
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            await run()
+            result.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report(benchmark: str, config: dict[str, Any], stages: list[StageResult]) -> dict[str, Any]:
+    """The machine-readable result document of one benchmark run."""
+    return {
+        "benchmark": benchmark,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": config,
+        "stages": {stage.name: stage.to_dict() for stage in stages},
+    }
+
+
+def write_report(document: dict[str, Any], output: str | None) -> None:
+    text = json.dumps(document, indent=2)
+    if output:
+        Path(output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+def compare(document: dict[str, Any], baseline_path: str) -> str:
+    """Median wall time of each stage against a previous result file."""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    lines = [f"{'stage':<16}{'baseline':>12}{'current':>12}{'change':>10}"]
+    for name, stage in document["stages"].items():
+        current = stage["wall_s"]["median"]
+        before = baseline.get("stages", {}).get(name, {}).get("wall_s", {}).get("median")
+        if before is None:
+            lines.append(f"{name:<16}{'—':>12}{current:>11.4f}s{'':>10}")
+            continue
+        change = (current - before) / before * 100 if before else 0.0
+        lines.append(f"{name:<16}{before:>11.4f}s{current:>11.4f}s{change:>+9.1f}%")
+    return "\n".join(lines)
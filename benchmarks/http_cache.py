@@ -0,0 +1,142 @@
+"""Offline benchmark and check of the scraper's HTTP cache.
+
+Fetches every page of the fixture corpus from the local site server (which
+sends ``ETag`` headers and honours ``If-None-Match``) through
+:class:`~app.services.brochure_generator.http_cache.HttpCache` and the
+scraper's real fetch function:
+
+* ``uncached`` — straight to the network, no cache;
+* ``cold`` — empty cache: every page is a miss and gets stored;
+* ``fresh`` — entries within the TTL: served from disk, no request;
+* ``revalidate`` — entries past the TTL: a conditional request each,
+  answered ``304 Not Modified``.
+
+Each cached stage must account for every page under the expected counter
+(misses, hits, revalidated), otherwise the benchmark exits with an error —
+so it doubles as an end-to-end check of the revalidation path.
+
+Usage::
+
+    python -m benchmarks.http_cache --output http_cache.json
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.corpus import build_corpus
+from benchmarks.harness import Counters, StageResult, compare, measure, report, write_report
+from benchmarks.site_server import serve_site
+
+# Stage → the HttpCache counter every page must land in
+_EXPECTED = {"cold": "misses", "fresh": "hits", "revalidate": "revalidated"}
+
+# Past any TTL by the time the next fetch happens (0 would mean "never expires")
+_EXPIRED_TTL = 1e-9
+
+
+async def _run(args: argparse.Namespace, base_url: str, cache_dir: Path) -> list[StageResult]:
+    from app.services.brochure_generator.http_cache import HttpCache
+    from app.services.brochure_generator.scraper import _fetch, preload
+
+    # Scrapling logs every fetch at INFO (its logger is set up on import)
+    preload()
+    logging.getLogger("scrapling").setLevel(logging.WARNING)
+
+    urls = [base_url.rstrip("/") + path for path in args.paths]
+    max_bytes = 1024 * 1024 * 1024
+
+    def _new_cache(name: str, ttl_seconds: float) -> HttpCache:
+        return HttpCache(cache_dir / name, ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+
+    async def _fetch_all(cache: HttpCache | None) -> Counters:
+        before = cache.stats() if cache is not None else {}
+        size = 0
+        for url in urls:
+            if cache is None:
+                html = (await asyncio.to_thread(_fetch, url)).html
+            else:
+                html = await asyncio.to_thread(cache.fetch, url, _fetch)
+            size += len(html)
+        counters: Counters = {"pages": len(urls), "bytes": size}
+        if cache is not None:
+            after = cache.stats()
+            for name in ("hits", "revalidated", "misses"):
+                counters[name] = after[name] - before[name]
+        return counters
+
+    cold_runs = 0
+
+    async def cold() -> Counters:
+        nonlocal cold_runs
+        cold_runs += 1  # a new, empty cache directory per run
+        return await _fetch_all(_new_cache(f"cold-{cold_runs}", ttl_seconds=3600))
+
+    fresh_cache = _new_cache("fresh", ttl_seconds=3600)
+    revalidate_cache = _new_cache("revalidate", ttl_seconds=_EXPIRED_TTL)
+    await _fetch_all(fresh_cache)
+    await _fetch_all(revalidate_cache)
+
+    stages = {
+        "uncached": lambda: _fetch_all(None),
+        "cold": cold,
+        "fresh": lambda: _fetch_all(fresh_cache),
+        "revalidate": lambda: _fetch_all(revalidate_cache),
+    }
+    results = []
+    for name, run in stages.items():
+        print(f"… {name}", file=sys.stderr)
+        results.append(await measure(name, run, repeat=args.repeat, trace_memory=False))
+    return results
+
+
+def _check(results: list[StageResult]) -> list[str]:
+    """Stages whose pages did not all take the expected cache path."""
+    failures = []
+    for stage in results:
+        counter = _EXPECTED.get(stage.name)
+        if counter and stage.counters.get(counter) != stage.counters["pages"]:
+            failures.append(
+                f"{stage.name}: expected {stage.counters['pages']:g} {counter}, got "
+                + ", ".join(f"{name}={stage.counters.get(name, 0):g}" for name in _EXPECTED.values())
+            )
+    return failures
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.http_cache",
+        description="Offline benchmark and check of the HTTP cache (local site with ETags).",
+    )
+    parser.add_argument("--pages", type=int, default=10, help="related pages on the site")
+    parser.add_argument("--site-latency", type=float, default=0.02, help="seconds per response")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage")
+    parser.add_argument("--output", help="write the JSON result here instead of stdout")
+    parser.add_argument(
+        "--baseline", help="earlier JSON result to compare against (printed to stderr)"
+    )
+    args = parser.parse_args(argv)
+
+    pages = build_corpus(args.pages)
+    args.paths = sorted(pages)
+    with tempfile.TemporaryDirectory(prefix="http-cache-bench-") as cache_dir:
+        with serve_site(pages, latency=args.site_latency) as base_url:
+            results = asyncio.run(_run(args, base_url, Path(cache_dir)))
+
+    config = {"pages": len(args.paths), "site_latency": args.site_latency, "repeat": args.repeat}
+    document = report("http_cache", config, results)
+    write_report(document, args.output)
+    if args.baseline:
+        print(compare(document, args.baseline), file=sys.stderr)
+
+    failures = _check(results)
+    if failures:
+        sys.exit("HTTP cache check failed:\n  " + "\n  ".join(failures))
+    print("HTTP cache check passed: misses, hits and 304 revalidations as expected", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
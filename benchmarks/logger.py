@@ -0,0 +1,173 @@
+"""Per-record cost of the structured logging pipeline, before and after.
+
+Compares the previous ``JSONFormatter`` (reserved keys rebuilt from a fresh
+``LogRecord`` on every attribute check, stdlib ``json``, file written on the
+calling thread) with the current one in ``config/logger.py``:
+
+* ``format_legacy`` / ``format_json`` / ``format`` — formatting one
+  middleware ``request_completed`` record with the old formatter, the new
+  one forced onto stdlib ``json``, and the new one as configured (``orjson``
+  when installed);
+* ``emit_sync`` — ``logger.info`` through the old synchronous
+  ``RotatingFileHandler`` setup, as the request path paid for it;
+* ``emit_queued`` — ``logger.info`` through the new queue handler; the
+  listener thread formats and writes in the background.
+
+Usage::
+
+    python -m benchmarks.logger --output logging.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import tempfile
+from datetime import datetime, timezone
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+from queue import SimpleQueue
+
+from benchmarks.harness import Counters, StageResult, compare, measure, report, write_report
+from config.logger import JSONFormatter, _dumps_json, _RecordQueueHandler
+
+
+class _LegacyJSONFormatter(logging.Formatter):
+    """``JSONFormatter`` as it was before the reserved keys were precomputed."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_entry: dict = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for field in ("request_id", "method", "path", "status_code", "duration_ms"):
+            value = getattr(record, field, None)
+            if value is not None:
+                log_entry[field] = value
+        for key, value in record.__dict__.items():
+            if key not in log_entry and key not in logging.LogRecord(
+                "", 0, "", 0, "", (), None
+            ).__dict__:
+                log_entry[key] = value
+        return json.dumps(log_entry, default=str)
+
+
+class _StdlibJSONFormatter(JSONFormatter):
+    serialize = staticmethod(_dumps_json)
+
+
+_EXTRA = {
+    "request_id": "4f9c2a7d0e5b4c1f8a3d6e9b2c5f8a1d",
+    "method": "POST",
+    "path": "/api/project1/stream",
+    "status_code": 200,
+    "duration_ms": 12.34,
+}
+
+
+def _record() -> logging.LogRecord:
+    logger = logging.getLogger("app.middleware")
+    return logger.makeRecord(
+        logger.name, logging.INFO, __file__, 0, "request_completed", (), None, extra=_EXTRA
+    )
+
+
+def _isolated_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"bench.{name}")
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+async def _run(args: argparse.Namespace, log_dir: Path) -> list[StageResult]:
+    record = _record()
+    records = args.records
+
+    def _format_with(formatter: logging.Formatter):
+        async def run() -> Counters:
+            for _ in range(records):
+                formatter.format(record)
+            return {"records": records}
+
+        return run
+
+    def _emit_with(logger: logging.Logger):
+        async def run() -> Counters:
+            for _ in range(records):
+                logger.info("request_completed", extra=_EXTRA)
+            return {"records": records}
+
+        return run
+
+    file_handler = RotatingFileHandler(
+        log_dir / "sync.log", maxBytes=5 * 1024 * 1024, backupCount=2, encoding="utf-8"
+    )
+    file_handler.setFormatter(_LegacyJSONFormatter())
+    sync_logger = _isolated_logger("sync", file_handler)
+
+    queued_file = RotatingFileHandler(
+        log_dir / "queued.log", maxBytes=5 * 1024 * 1024, backupCount=2, encoding="utf-8"
+    )
+    queued_file.setFormatter(JSONFormatter())
+    log_queue: SimpleQueue = SimpleQueue()
+    listener = QueueListener(log_queue, queued_file, respect_handler_level=True)
+    queued_logger = _isolated_logger("queued", _RecordQueueHandler(log_queue))
+
+    stages = {
+        "format_legacy": _format_with(_LegacyJSONFormatter()),
+        "format_json": _format_with(_StdlibJSONFormatter()),
+        "format": _format_with(JSONFormatter()),
+        "emit_sync": _emit_with(sync_logger),
+        "emit_queued": _emit_with(queued_logger),
+    }
+    results = []
+    listener.start()
+    try:
+        for name, run in stages.items():
+            print(f"… {name}", file=sys.stderr)
+            result = await measure(name, run, repeat=args.repeat, trace_memory=False)
+            result.extra["per_record_us"] = statistics.median(result.wall) / records * 1e6
+            results.append(result)
+    finally:
+        listener.stop()  # drain what the queued stage left behind
+        file_handler.close()
+        queued_file.close()
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.logger",
+        description="Per-record cost of the JSON logging pipeline, old vs new.",
+    )
+    parser.add_argument("--records", type=int, default=20_000, help="records per timed run")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage")
+    parser.add_argument("--output", help="write the JSON result here instead of stdout")
+    parser.add_argument(
+        "--baseline", help="earlier JSON result to compare against (printed to stderr)"
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="logging-bench-") as log_dir:
+        results = asyncio.run(_run(args, Path(log_dir)))
+
+    try:
+        import orjson  # noqa: F401
+        serializer = "orjson"
+    except ImportError:
+        serializer = "json"
+    config = {"records": args.records, "repeat": args.repeat, "serializer": serializer}
+    document = report("logging", config, results)
+    write_report(document, args.output)
+    for stage in results:
+        print(f"{stage.name:<16}{stage.extra['per_record_us']:>8.2f} µs/record", file=sys.stderr)
+    if args.baseline:
+        print(compare(document, args.baseline), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Per-request overhead of the request logging middleware, before and after.
+
+Drives a minimal FastAPI app in-process through ``httpx.ASGITransport`` (no
+sockets) with the previous ``BaseHTTPMiddleware`` implementation and with
+the current pure-ASGI ``RequestLoggingMiddleware``:
+
+* ``json_legacy`` / ``json`` — a small JSON endpoint;
+* ``stream_legacy`` / ``stream`` — a 20-chunk SSE-style stream.
+
+Log records are created but discarded, so only the middleware itself is
+measured (see ``benchmarks.logger`` for the formatting and file cost).
+
+Usage::
+
+    python -m benchmarks.middleware --output middleware.json
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from benchmarks.harness import Counters, StageResult, compare, measure, report, write_report
+from config.middleware import RequestLoggingMiddleware
+
+logger = logging.getLogger("app.middleware")
+
+
+class _LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """``RequestLoggingMiddleware`` as it was before the pure-ASGI rewrite."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        start = time.perf_counter()
+        response: Response = await call_next(request)
+        duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        status = response.status_code
+        if status >= 500:
+            log_level = logging.ERROR
+        elif status >= 400:
+            log_level = logging.WARNING
+        else:
+            log_level = logging.INFO
+        logger.log(
+            log_level,
+            "request_completed",
+            extra={
+                "request_id": request_id,
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": status,
+                "duration_ms": duration_ms,
+            },
+        )
+        response.headers["X-Request-ID"] = str(request_id)
+        return response
+
+
+def _build_app(middleware: type, chunks: int) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/json")
+    async def json_endpoint() -> dict:
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    async def stream_endpoint() -> StreamingResponse:
+        async def events():
+            for index in range(chunks):
+                yield f"data: token {index}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+async def _run(args: argparse.Namespace) -> list[StageResult]:
+    requests = args.requests
+    apps = {
+        "legacy": _build_app(_LegacyRequestLoggingMiddleware, args.chunks),
+        "asgi": _build_app(RequestLoggingMiddleware, args.chunks),
+    }
+
+    def _requests_to(app: FastAPI, path: str):
+        async def run() -> Counters:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for _ in range(requests):
+                    response = await client.get(path)
+                    response.raise_for_status()
+            return {"requests": requests}
+
+        return run
+
+    stages = {
+        "json_legacy": _requests_to(apps["legacy"], "/json"),
+        "json": _requests_to(apps["asgi"], "/json"),
+        "stream_legacy": _requests_to(apps["legacy"], "/stream"),
+        "stream": _requests_to(apps["asgi"], "/stream"),
+    }
+    results = []
+    for name, run in stages.items():
+        print(f"… {name}", file=sys.stderr)
+        result = await measure(name, run, repeat=args.repeat, trace_memory=False)
+        result.extra["per_request_us"] = statistics.median(result.wall) / requests * 1e6
+        results.append(result)
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.middleware",
+        description="Per-request overhead of the request logging middleware, old vs new.",
+    )
+    parser.add_argument("--requests", type=int, default=2000, help="requests per timed run")
+    parser.add_argument("--chunks", type=int, default=20, help="chunks per streamed response")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage")
+    parser.add_argument("--output", help="write the JSON result here instead of stdout")
+    parser.add_argument(
+        "--baseline", help="earlier JSON result to compare against (printed to stderr)"
+    )
+    args = parser.parse_args(argv)
+
+    # Records are created at INFO as in production, then dropped
+    logger.handlers[:] = [logging.NullHandler()]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    results = asyncio.run(_run(args))
+
+    config = {"requests": args.requests, "chunks": args.chunks, "repeat": args.repeat}
+    document = report("middleware", config, results)
+    write_report(document, args.output)
+    for stage in results:
+        print(f"{stage.name:<16}{stage.extra['per_request_us']:>9.1f} µs/request", file=sys.stderr)
+    if args.baseline:
+        print(compare(document, args.baseline), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Offline benchmark of the brochure pipeline, stage by stage and end to end.
+
+Serves the fixture corpus from a local server, swaps Gemini for
+:class:`~benchmarks.fake_llm.FakeChatModel`, and measures:
+
+* ``fetch`` — main page, link ranking and related pages (pages/s, bytes/s);
+* ``clean`` — text extraction, deduplication and combining (pages/s, bytes/s);
+* ``generate`` — map phase (if any) and the streamed brochure (tokens/s,
+  time to first token);
+* ``end_to_end`` — ``run_pipeline_stream`` as a client sees it.
+
+The HTTP, summary, brochure and checkpoint caches are switched off so every
+run does the full work.  Other settings (pipeline mode, clean backend,
+concurrency limits, token budgets) come from the environment / ``.env`` as
+usual, so the same command benchmarks any configuration.
+
+Usage::
+
+    python -m benchmarks.pipeline --output bench.json
+    python -m benchmarks.pipeline --baseline bench.json   # compare with an earlier run
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any
+
+from benchmarks.corpus import build_corpus
+from benchmarks.fake_llm import FakeChatModel, use_fake_llm
+from benchmarks.harness import Counters, StageResult, compare, measure, report, write_report
+from benchmarks.site_server import serve_site
+from config.settings import settings
+
+_STAGES = ("fetch", "clean", "generate", "end_to_end")
+
+
+def _configure(cache_dir: str, args: argparse.Namespace) -> None:
+    settings.cache_dir = cache_dir
+    settings.http_cache_enabled = False
+    settings.summary_cache_enabled = False
+    settings.brochure_cache_enabled = False
+    settings.checkpoint_enabled = False
+    if args.context_tokens:
+        settings.llm_context_tokens = args.context_tokens
+    if args.map_chunk_tokens:
+        settings.llm_map_chunk_tokens = args.map_chunk_tokens
+
+
+async def _run(args: argparse.Namespace, base_url: str) -> list[StageResult]:
+    from app.services.brochure_generator import run_pipeline_stream
+    from app.services.brochure_generator.content_cleaner import acombine_and_clean
+    from app.services.brochure_generator.llm_summarizer import agenerate_brochure_stream
+    from app.services.brochure_generator.scraper import (
+        filter_related_links,
+        preload,
+        scrape_main_page,
+        scrape_related_pages_concurrent,
+    )
+
+    # Scrapling logs every fetch at INFO (its logger is set up on import,
+    # which the scraper defers to the first fetch)
+    preload()
+    logging.getLogger("scrapling").setLevel(logging.WARNING)
+
+    fake = FakeChatModel(
+        latency=args.llm_latency,
+        tokens_per_second=args.tokens_per_second,
+        output_tokens=args.output_tokens,
+        summary_tokens=args.summary_tokens,
+    )
+    # Inputs of the later stages, produced by the earlier ones
+    html, related_pages, cleaned_text = "", [], ""
+    results: list[StageResult] = []
+
+    async def fetch() -> Counters:
+        nonlocal html, related_pages
+        html, links = await asyncio.to_thread(scrape_main_page, base_url)
+        related_pages = await scrape_related_pages_concurrent(filter_related_links(base_url, links))
+        return {
+            "pages": 1 + len(related_pages),
+            "bytes": len(html) + sum(len(page["html"]) for page in related_pages),
+        }
+
+    async def clean() -> Counters:
+        nonlocal cleaned_text
+        cleaned_text = await acombine_and_clean(html, related_pages)
+        return {
+            "pages": 1 + len(related_pages),
+            "bytes": len(html) + sum(len(page["html"]) for page in related_pages),
+            "output_chars": len(cleaned_text),
+        }
+
+    async def generate() -> Counters:
+        calls, tokens = fake.calls, fake.tokens
+        start = time.perf_counter()
+        first_token = None
+        async for _ in agenerate_brochure_stream(cleaned_text):
+            if first_token is None:
+                first_token = time.perf_counter() - start
+        ttft.append(first_token or 0.0)
+        return {"llm_calls": fake.calls - calls, "tokens": fake.tokens - tokens}
+
+    async def end_to_end() -> Counters:
+        tokens = fake.tokens
+        start = time.perf_counter()
+        first_token = None
+        generating = False
+        chunks = 0
+        async for chunk in run_pipeline_stream(base_url):
+            chunks += 1
+            # Brochure text follows the "✨ Generating brochure…" progress message
+            if generating and first_token is None and not chunk.startswith("📝"):
+                first_token = time.perf_counter() - start
+            generating = generating or chunk.startswith("✨")
+        ttft.append(first_token or 0.0)
+        return {"chunks": chunks, "tokens": fake.tokens - tokens}
+
+    stages = {"fetch": fetch, "clean": clean, "generate": generate, "end_to_end": end_to_end}
+    with use_fake_llm(fake):
+        for name in _STAGES:
+            # Later stages need the earlier stages' output even when not reported
+            if name not in args.stages:
+                if name in ("fetch", "clean"):
+                    await stages[name]()
+                continue
+            ttft: list[float] = []
+            print(f"… {name}", file=sys.stderr)
+            result = await measure(
+                name,
+                stages[name],
+                repeat=args.repeat,
+                warmup=args.warmup,
+                trace_memory=not args.no_memory,
+            )
+            if ttft:
+                # Only the timed runs: they follow the warm-up, the memory run comes last
+                timed = ttft[args.warmup : args.warmup + args.repeat]
+                result.extra["time_to_first_token_s"] = statistics.median(timed)
+            results.append(result)
+    return results
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.pipeline",
+        description="Offline benchmark of the brochure pipeline (local site, fake LLM).",
+    )
+    parser.add_argument("--stages", nargs="+", choices=_STAGES, default=list(_STAGES))
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per stage")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    corpus = parser.add_argument_group("corpus")
+    corpus.add_argument("--pages", type=int, default=10, help="related pages on the site")
+    corpus.add_argument("--text-kb", type=int, default=12, help="prose per page")
+    corpus.add_argument("--asset-kb", type=int, default=80, help="inline CSS/JS per page")
+    corpus.add_argument("--site-latency", type=float, default=0.05, help="seconds per response")
+    corpus.add_argument("--seed", type=int, default=0)
+    llm = parser.add_argument_group("fake LLM")
+    llm.add_argument("--llm-latency", type=float, default=0.3, help="seconds to first token")
+    llm.add_argument("--tokens-per-second", type=float, default=200.0)
+    llm.add_argument("--output-tokens", type=int, default=800, help="tokens per brochure")
+    llm.add_argument("--summary-tokens", type=int, default=150, help="tokens per chunk summary")
+    llm.add_argument(
+        "--context-tokens", type=int, default=0,
+        help="override APP_LLM_CONTEXT_TOKENS (small values force map-reduce)",
+    )
+    llm.add_argument(
+        "--map-chunk-tokens", type=int, default=0, help="override APP_LLM_MAP_CHUNK_TOKENS"
+    )
+    out = parser.add_argument_group("output")
+    out.add_argument("--output", help="write the JSON result here instead of stdout")
+    out.add_argument(
+        "--baseline", help="earlier JSON result to compare against (printed to stderr)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    pages = build_corpus(args.pages, text_kb=args.text_kb, asset_kb=args.asset_kb, seed=args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="brochure-bench-") as cache_dir:
+        _configure(cache_dir, args)
+        with serve_site(pages, latency=args.site_latency) as base_url:
+            results = asyncio.run(_run(args, base_url))
+
+        from app.services.brochure_generator.content_cleaner import shutdown_clean_pool
+
+        shutdown_clean_pool()
+
+    config: dict[str, Any] = {
+        key: value for key, value in vars(args).items() if key not in ("output", "baseline")
+    }
+    config["corpus_bytes"] = sum(len(html.encode("utf-8")) for html in pages.values())
+    config["settings"] = {
+        key: getattr(settings, key)
+        for key in (
+            "pipeline_mode",
+            "clean_backend",
+            "clean_workers",
+            "scrape_max_concurrency",
+            "scrape_per_host_concurrency",
+            "llm_map_concurrency",
+            "llm_context_tokens",
+            "llm_map_chunk_tokens",
+            "dedup_enabled",
+            "sitemap_enabled",
+        )
+    }
+    document = report("pipeline", config, results)
+    write_report(document, args.output)
+    if args.baseline:
+        print(compare(document, args.baseline), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
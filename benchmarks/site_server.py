@@ -0,0 +1,66 @@
+"""Local stand-in web server for the benchmark corpus."""
+
+import hashlib
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    server: "_SiteServer"
+
+    def do_GET(self) -> None:
+        time.sleep(self.server.latency)  # network round trip of a real site
+        page = self.server.pages.get(self.path.split("?", 1)[0])
+        self.server.requests += 1
+        if page is None:
+            self.send_error(404)
+            return
+        etag = self.server.etags[page]
+        if self.headers.get("If-None-Match") == etag:
+            self.server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, format: str, *args) -> None:
+        pass  # keep benchmark output clean
+
+
+class _SiteServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, pages: dict[str, str], latency: float) -> None:
+        super().__init__(("127.0.0.1", 0), _SiteHandler)
+        self.pages = {path: html.encode("utf-8") for path, html in pages.items()}
+        self.etags = {page: f'"{hashlib.sha1(page).hexdigest()[:16]}"' for page in self.pages.values()}
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+
+
+@contextmanager
+def serve_site(pages: dict[str, str], *, latency: float = 0.0) -> Iterator[str]:
+    """Serve ``{path: html}`` on a free localhost port and yield the base URL.
+
+    Every response is delayed by ``latency`` seconds; unknown paths are 404
+    (including ``robots.txt`` and ``sitemap.xml``).  Pages carry an ``ETag``
+    and a matching ``If-None-Match`` is answered with ``304 Not Modified``.
+    """
+    server = _SiteServer(pages, latency)
+    thread = threading.Thread(target=server.serve_forever, name="bench-site", daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
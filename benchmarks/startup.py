@@ -0,0 +1,154 @@
+"""Cold-start cost of the app: import time per package and time to first health check.
+
+Each run starts a fresh interpreter, so nothing is shared between runs:
+
+* ``import_full`` / ``import_api`` — ``import main`` with the Gradio UI and
+  in API-only mode (``APP_UI_ENABLED=false``);
+* ``health_full`` / ``health_api`` — from launching uvicorn until
+  ``GET /api/health`` first answers 200.
+
+The report also lists where the import time goes, per top-level package,
+from ``python -X importtime`` (self time summed over the package's modules).
+
+Usage::
+
+    python -m benchmarks.startup --output startup.json
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter as Tally
+from pathlib import Path
+
+import httpx
+
+from benchmarks.harness import Counters, StageResult, compare, measure, report, write_report
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+_MODES = {"full": {"APP_UI_ENABLED": "true"}, "api": {"APP_UI_ENABLED": "false"}}
+
+
+def _environment(mode: str) -> dict[str, str]:
+    # No live Gemini connection while measuring startup
+    return {**os.environ, **_MODES[mode], "APP_LLM_WARMUP": "false"}
+
+
+def import_profile(mode: str) -> dict[str, float]:
+    """Milliseconds of self import time per top-level package for ``import main``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=_PROJECT_ROOT, env=_environment(mode), capture_output=True, text=True, check=True,
+    )
+    tally: Tally[str] = Tally()
+    for line in completed.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, _, package = line.removeprefix("import time:").split("|")
+        tally[package.strip().split(".")[0]] += int(self_us)
+    return {package: self_us / 1000 for package, self_us in tally.most_common()}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _time_to_health(mode: str, timeout: float) -> None:
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=_PROJECT_ROOT, env=_environment(mode),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        with httpx.Client(timeout=1.0) as client:
+            while time.monotonic() < deadline:
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/api/health").status_code == 200:
+                        return
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.02)
+        raise TimeoutError(f"/api/health did not answer within {timeout}s ({mode} mode)")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def _run(args: argparse.Namespace) -> list[StageResult]:
+    def _import(mode: str):
+        async def run() -> Counters:
+            await asyncio.to_thread(
+                subprocess.run,
+                [sys.executable, "-c", "import main"],
+                cwd=_PROJECT_ROOT, env=_environment(mode), check=True,
+            )
+            return {}
+
+        return run
+
+    def _health(mode: str):
+        async def run() -> Counters:
+            await asyncio.to_thread(_time_to_health, mode, args.timeout)
+            return {}
+
+        return run
+
+    stages = {}
+    for mode in args.modes:
+        stages[f"import_{mode}"] = _import(mode)
+        stages[f"health_{mode}"] = _health(mode)
+
+    results = []
+    for name, run in stages.items():
+        print(f"… {name}", file=sys.stderr)
+        results.append(await measure(name, run, repeat=args.repeat, trace_memory=False))
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.startup",
+        description="Cold-start import time and time to the first /api/health response.",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage")
+    parser.add_argument(
+        "--modes", nargs="+", choices=sorted(_MODES), default=["full", "api"],
+        help="with the Gradio UI (full) and/or API only (api)",
+    )
+    parser.add_argument("--top", type=int, default=15, help="packages listed in the import profile")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for /api/health")
+    parser.add_argument("--output", help="write the JSON result here instead of stdout")
+    parser.add_argument(
+        "--baseline", help="earlier JSON result to compare against (printed to stderr)"
+    )
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(_run(args))
+    profiles = {mode: import_profile(mode) for mode in args.modes}
+
+    config = {"repeat": args.repeat, "modes": args.modes}
+    document = report("startup", config, results)
+    document["import_ms_by_package"] = {
+        mode: dict(list(profile.items())[: args.top]) for mode, profile in profiles.items()
+    }
+    write_report(document, args.output)
+    for mode, profile in profiles.items():
+        print(f"\nimport time by package ({mode}):", file=sys.stderr)
+        for package, milliseconds in list(profile.items())[: args.top]:
+            print(f"  {package:<28}{milliseconds:>9.1f} ms", file=sys.stderr)
+    if args.baseline:
+        print(compare(document, args.baseline), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
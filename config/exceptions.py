@@ -11,10 +11,13 @@ logger = logging.getLogger("app.exceptions")
 # Standard error response shape
 # ──────────────────────────────────────────────
 
-def _error_response(status_code: int, detail: str) -> JSONResponse:
+def _error_response(
+    status_code: int, detail: str, headers: dict[str, str] | None = None
+) -> JSONResponse:
     return JSONResponse(
         status_code=status_code,
         content={"detail": detail, "status_code": status_code},
+        headers=headers,
     )
 
 
@@ -40,7 +43,8 @@ def register_exception_handlers(app: FastAPI) -> None:
     async def http_exception_handler(
         request: Request, exc: HTTPException
     ) -> JSONResponse:
-        return _error_response(exc.status_code, exc.detail)
+        # Keep headers such as Retry-After set by the route
+        return _error_response(exc.status_code, exc.detail, headers=exc.headers)
 
     @app.exception_handler(Exception)
     async def unhandled_exception_handler(
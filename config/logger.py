@@ -1,13 +1,61 @@
+import atexit
+import copy
 import json
 import logging
 import os
+import queue
 from datetime import datetime, timezone
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+try:
+    import orjson
+except ImportError:  # optional — stdlib json is used instead
+    orjson = None
+
+# ──────────────────────────────────────────────
+# Serialisation
+# ──────────────────────────────────────────────
+
+def _dumps_json(log_entry: dict) -> str:
+    return json.dumps(log_entry, default=str)
+
+
+if orjson is not None:
+    # Hand datetimes, dataclasses and str/int/dict subclasses to ``default``
+    # so they serialise exactly as with ``json.dumps(default=str)``.
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+    def _dumps(log_entry: dict) -> str:
+        try:
+            return orjson.dumps(log_entry, default=str, option=_ORJSON_OPTIONS).decode()
+        except TypeError:  # e.g. integers beyond 64 bits — let stdlib json handle it
+            return _dumps_json(log_entry)
+else:
+    _dumps = _dumps_json
+
 
 # ──────────────────────────────────────────────
 # Structured JSON Formatter
 # ──────────────────────────────────────────────
 
+# Attributes every LogRecord has — anything else on a record came from
+# ``extra={...}``.  Computed once instead of per record.
+_RESERVED_ATTRS = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime"}
+
+# Middleware-attached fields, emitted first and in this order
+_REQUEST_FIELDS = (
+    "request_id", "method", "path", "status_code", "duration_ms",
+    "ttfb_ms", "bytes_sent", "chunks_sent", "client_disconnected",
+)
+
+
 class JSONFormatter(logging.Formatter):
     """Outputs each log record as a single JSON line.
 
@@ -15,9 +63,16 @@ class JSONFormatter(logging.Formatter):
         timestamp, level, message
 
     Middleware-injected fields (present only on request logs):
-        request_id, method, path, status_code, duration_ms
+        request_id, method, path, status_code, duration_ms,
+        ttfb_ms, bytes_sent, chunks_sent, client_disconnected
+
+    Lines are serialised with ``orjson`` when it is installed (falling back
+    to the stdlib ``json`` module), so separators differ but the fields
+    and values are the same.
     """
 
+    serialize = staticmethod(_dumps)
+
     def format(self, record: logging.LogRecord) -> str:
         log_entry: dict = {
             "timestamp": datetime.fromtimestamp(
@@ -28,26 +83,43 @@ class JSONFormatter(logging.Formatter):
         }
 
         # Middleware attaches these via `extra={...}`
-        for field in (
-            "request_id",
-            "method",
-            "path",
-            "status_code",
-            "duration_ms",
-        ):
-            value = getattr(record, field, None)
+        attrs = record.__dict__
+        for field in _REQUEST_FIELDS:
+            value = attrs.get(field)
             if value is not None:
                 log_entry[field] = value
 
         # Allow any other extra keys that services might pass
         # (e.g. model, tokens, latency)
-        for key, value in record.__dict__.items():
-            if key not in log_entry and key not in logging.LogRecord(
-                "", 0, "", 0, "", (), None
-            ).__dict__:
+        for key, value in attrs.items():
+            if key not in _RESERVED_ATTRS and key not in log_entry:
                 log_entry[key] = value
 
-        return json.dumps(log_entry, default=str)
+        return self.serialize(log_entry)
+
+
+# ──────────────────────────────────────────────
+# Non-blocking handler
+# ──────────────────────────────────────────────
+
+class _RecordQueueHandler(QueueHandler):
+    """Queues records for the background listener without formatting them.
+
+    The stock ``prepare`` formats the record on the calling thread (and
+    folds tracebacks into the message); here only the message is merged with
+    its arguments, so the JSON formatting and the file write both happen on
+    the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        record = copy.copy(record)  # other handlers may still see the original
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        record.stack_info = None
+        return record
 
 
 # ──────────────────────────────────────────────
@@ -66,6 +138,9 @@ _BACKUP_COUNT = 5              # keep 5 rotated copies
 # e.g.  logging.getLogger("app.middleware"), logging.getLogger("app.scraper")
 APP_LOGGER_NAME = "app"
 
+# Background thread that formats queued records and writes the log file
+_listener: QueueListener | None = None
+
 
 def setup_logging(level: str = "INFO") -> None:
     """Configure the *app* logger with a rotating-file JSON handler.
@@ -74,16 +149,21 @@ def setup_logging(level: str = "INFO") -> None:
     Uvicorn / WatchFiles / third-party loggers are **not** attached, so
     writing to the log file will never trigger the dev-server file watcher.
 
+    Records are put on an in-memory queue; a background listener thread
+    formats them and writes (and rotates) the file, so logging never blocks
+    the caller on disk I/O.  Call :func:`shutdown_logging` to flush it.
+
     Call once at app startup (before any request is served).
     ``level`` accepts standard names: DEBUG, INFO, WARNING, ERROR, CRITICAL.
     """
+    global _listener
 
     os.makedirs(_LOG_DIR, exist_ok=True)
 
     numeric_level = getattr(logging, level.upper(), logging.INFO)
     json_formatter = JSONFormatter()
 
-    # ── File handler (rotating) ──
+    # ── File handler (rotating) — driven by the listener thread ──
     file_handler = RotatingFileHandler(
         _LOG_FILE,
         maxBytes=_MAX_BYTES,
@@ -93,11 +173,29 @@ def setup_logging(level: str = "INFO") -> None:
     file_handler.setLevel(numeric_level)
     file_handler.setFormatter(json_formatter)
 
+    shutdown_logging()                    # a previous listener (reload) is flushed first
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+
     # ── App logger (NOT root) ──
     app_logger = logging.getLogger(APP_LOGGER_NAME)
     app_logger.setLevel(numeric_level)
     app_logger.handlers.clear()           # avoid duplicate handlers on reload
-    app_logger.addHandler(file_handler)
+    app_logger.addHandler(_RecordQueueHandler(log_queue))
     app_logger.propagate = False          # don't bubble up to root / console
 
     app_logger.info("logging_initialized", extra={"log_level": level})
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener thread (idempotent)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
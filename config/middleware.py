@@ -2,21 +2,28 @@ import logging
 import time
 import uuid
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger("app.middleware")
 
+_REQUEST_ID_HEADER = b"x-request-id"
+
 # ──────────────────────────────────────────────
 # Request Logging Middleware
 # ──────────────────────────────────────────────
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """Logs one structured JSON entry per HTTP request.
 
     Emitted fields:
-        request_id, method, path, status_code, duration_ms
+        request_id, method, path, status_code, duration_ms,
+        ttfb_ms, bytes_sent, chunks_sent, client_disconnected
+
+    ``ttfb_ms`` is the time until the response headers were sent and
+    ``duration_ms`` the time until the last body byte, so a streamed
+    (SSE) response is measured over its whole lifetime rather than up to
+    its headers.  ``client_disconnected`` is true when the client dropped
+    the connection before the response finished.
 
     The middleware also:
     - Accepts an inbound ``X-Request-ID`` header (or generates a UUID).
@@ -27,44 +34,91 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         3xx  → INFO
         4xx  → WARNING
         5xx  → ERROR
+
+    Implemented as plain ASGI rather than ``BaseHTTPMiddleware``: the
+    response body passes straight through without being re-wrapped in a
+    stream and a background task per request.
     """
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # ── Request ID ──
-        request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == _REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")
+                break
+        request_id = request_id or uuid.uuid4().hex
+        request_id_header = (_REQUEST_ID_HEADER, request_id.encode("latin-1"))
 
-        # ── Timing ──
+        # ── Timing and response accounting ──
         start = time.perf_counter()
+        status = 500  # if the app fails before it starts a response
+        first_byte: float | None = None
+        last_byte: float | None = None
+        bytes_sent = 0
+        chunks_sent = 0
+        disconnected = False
+
+        async def receive_wrapper() -> Message:
+            nonlocal disconnected
+            message = await receive()
+            # Servers also report a disconnect once the response is complete
+            if message["type"] == "http.disconnect" and last_byte is None:
+                disconnected = True
+            return message
 
-        response: Response = await call_next(request)
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, first_byte, last_byte, bytes_sent, chunks_sent, disconnected
+            message_type = message["type"]
+            if message_type == "http.response.start":
+                status = message["status"]
+                # ── Echo request ID to caller ──
+                message["headers"] = [*message.get("headers", ()), request_id_header]
+                first_byte = time.perf_counter()
+            elif message_type == "http.response.body":
+                body = message.get("body", b"")
+                if body:
+                    bytes_sent += len(body)
+                    chunks_sent += 1
+                if not message.get("more_body", False):
+                    last_byte = time.perf_counter()
+            try:
+                await send(message)
+            except OSError:
+                disconnected = True
+                raise
 
-        duration_ms = round((time.perf_counter() - start) * 1000, 2)
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            end = last_byte or time.perf_counter()
 
-        # ── Choose log level based on status code ──
-        status = response.status_code
-        if status >= 500:
-            log_level = logging.ERROR
-        elif status >= 400:
-            log_level = logging.WARNING
-        else:
-            log_level = logging.INFO
+            # ── Choose log level based on status code ──
+            if status >= 500:
+                log_level = logging.ERROR
+            elif status >= 400:
+                log_level = logging.WARNING
+            else:
+                log_level = logging.INFO
 
-        # ── Structured log entry ──
-        logger.log(
-            log_level,
-            "request_completed",
-            extra={
+            # ── Structured log entry ──
+            extra = {
                 "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
+                "method": scope["method"],
+                "path": scope["path"],
                 "status_code": status,
-                "duration_ms": duration_ms,
-            },
-        )
-
-        # ── Echo request ID to caller ──
-        response.headers["X-Request-ID"] = str(request_id)
-
-        return response
+                "duration_ms": round((end - start) * 1000, 2),
+                "bytes_sent": bytes_sent,
+                "chunks_sent": chunks_sent,
+                "client_disconnected": disconnected,
+            }
+            if first_byte is not None:
+                extra["ttfb_ms"] = round((first_byte - start) * 1000, 2)
+            logger.log(log_level, "request_completed", extra=extra)
@@ -11,9 +11,78 @@ class Settings(BaseSettings):
     # Logging
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
 
+    # Startup — Gradio and the pipeline libraries are the slow imports
+    ui_enabled: bool = True                  # mount the Gradio UI at /; false = API only
+    prewarm_enabled: bool = True             # load pipeline libraries in the background after startup
+
     # Google Gemini / LangChain
     google_api_key: str = ""
     gemini_model: str = "gemini-3-flash-preview"
+    llm_map_concurrency: int = 4             # chunk summaries requested in parallel
+    llm_stream_queue_size: int = 64          # tokens buffered ahead of a slow client
+    llm_warmup: bool = True                  # connect to Gemini at startup
+
+    # Token budgets — one LLM call is used whenever the cleaned text fits
+    llm_context_tokens: int = 0              # context window; 0 = known value for gemini_model
+    llm_output_tokens: int = 8_192           # reserved for the generated brochure
+    llm_map_chunk_tokens: int = 32_000       # chunk size when map-reduce is needed
+
+    # Pipeline — "pipelined" overlaps scrape/clean/map; "staged" runs them in turn
+    pipeline_mode: Literal["staged", "pipelined"] = "pipelined"
+
+    # Admission control — concurrent runs, wait queue, fast-reject hint
+    pipeline_max_active: int = 8
+    pipeline_max_queued: int = 16
+    pipeline_retry_after_seconds: int = 30
+
+    # Process-wide concurrency budgets per stage (across all runs)
+    stage_fetch_limit: int = 16              # page fetches in flight
+    stage_clean_limit: int = 4               # pages being cleaned
+    stage_llm_limit: int = 4                 # Gemini requests (summaries, brochure streams)
+
+    # Batch generation — background workers shared by all batches
+    batch_workers: int = 2                   # batch items generated at once
+    batch_max_urls: int = 500                # URLs accepted per batch
+    batch_retention_seconds: float = 86_400  # finished batches kept for polling
+
+    # Background jobs — state and results kept in SQLite
+    jobs_db_path: str = "data/jobs.sqlite3"
+    jobs_retention_seconds: float = 604_800  # finished jobs kept (7 days)
+
+    # Scraping — related-page fetch concurrency
+    scrape_max_concurrency: int = 5          # related pages fetched at once (global)
+    scrape_per_host_concurrency: int = 3     # ...of which at most this many per host
+    scrape_deadline_seconds: float = 45.0    # whole related-page stage; 0 disables
+
+    # Sitemap discovery — robots.txt / sitemap.xml URLs join the link ranking
+    sitemap_enabled: bool = True
+    sitemap_max_urls: int = 5_000            # page URLs read before stopping
+    sitemap_max_files: int = 5               # sitemap files read (index + children)
+    sitemap_wait_seconds: float = 0.25       # extra wait after the main page, then stop the walk
+
+    # Content cleaning — "thread" (default) or a shared worker-process pool
+    clean_backend: Literal["thread", "process"] = "thread"
+    clean_workers: int = 0                   # process-pool size; 0 = CPU count
+
+    # Cross-page deduplication — drop repeated blocks and near-duplicate pages
+    dedup_enabled: bool = True
+    dedup_page_similarity: float = 0.9       # shingle (Jaccard) similarity for a duplicate page
+
+    # On-disk caches (relative paths resolve against the project root;
+    # a *_ttl_seconds of 0 means entries never expire)
+    cache_dir: str = "cache"
+    http_cache_enabled: bool = True
+    http_cache_ttl_seconds: float = 3600.0   # serve without revalidating for this long; 0 = forever
+    http_cache_max_bytes: int = 200 * 1024 * 1024
+    brochure_cache_enabled: bool = True
+    brochure_cache_ttl_seconds: float = 7 * 24 * 3600.0
+    brochure_cache_max_bytes: int = 50 * 1024 * 1024
+    summary_cache_enabled: bool = True
+    summary_cache_ttl_seconds: float = 30 * 24 * 3600.0
+    summary_cache_max_bytes: int = 100 * 1024 * 1024
+    checkpoint_enabled: bool = True          # per-run stage outputs, so retries resume
+    checkpoint_ttl_seconds: float = 24 * 3600.0
+    checkpoint_max_bytes: int = 200 * 1024 * 1024
 
     model_config = SettingsConfigDict(
         env_file=(".env",),
@@ -1,19 +1,60 @@
-import gradio as gr
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.services.brochure_generator.batch import batch_runner
+from app.services.brochure_generator.content_cleaner import shutdown_clean_pool
+from app.services.brochure_generator.jobs import job_manager
+from app.services.brochure_generator.llm_summarizer import warm_up_llm
+from app.services.brochure_generator.task_manager import preload_pipeline
 from config.exceptions import register_exception_handlers
 from config.logger import setup_logging
 from config.middleware import RequestLoggingMiddleware
 from config.settings import settings
 from routes.api import api_router
-from ui.gradio_app import create_gradio_interface
+
+logger = logging.getLogger("app.main")
+
+
+async def _warm_up() -> None:
+    """Load the pipeline libraries, then open the shared LLM client.
+
+    Runs in the background, so requests are served while it is in progress.
+    """
+    if settings.prewarm_enabled:
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(preload_pipeline)
+            logger.info("Pipeline libraries loaded in %.2fs", time.perf_counter() - started)
+        except Exception as exc:
+            logger.warning("Pipeline pre-warm failed: %s", exc)
+    if settings.llm_warmup:
+        await warm_up_llm()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # ── Warm up off the startup path — /api/health answers straight away ──
+    warm_up = asyncio.create_task(_warm_up())
+    # ── Recover the job store (jobs cut off by a restart, expired results) ──
+    await job_manager.startup()
+    yield
+    warm_up.cancel()
+    # ── Release long-lived worker pools ──
+    await job_manager.shutdown()
+    await batch_runner.shutdown()
+    shutdown_clean_pool()
 
 
 def create_app() -> FastAPI:
     # ── Initialize structured logging ──
     setup_logging(level=settings.log_level)
 
-    app = FastAPI(title=settings.app_name, version=settings.app_version)
+    app = FastAPI(title=settings.app_name, version=settings.app_version, lifespan=lifespan)
 
     # ── Register middleware (runs on every request) ──
     app.add_middleware(RequestLoggingMiddleware)
@@ -23,9 +64,14 @@ def create_app() -> FastAPI:
 
     app.include_router(api_router)
 
-    # Mount Gradio interface at root
-    gradio_app = create_gradio_interface()
-    app = gr.mount_gradio_app(app, gradio_app, path="/")
+    # Mount Gradio interface at root — skipped (never imported) in API-only mode
+    if settings.ui_enabled:
+        import gradio as gr
+
+        from ui.gradio_app import create_gradio_interface
+
+        gradio_app = create_gradio_interface()
+        app = gr.mount_gradio_app(app, gradio_app, path="/")
 
     return app
 
@@ -42,5 +88,5 @@ if __name__ == "__main__":
         reload=True,
         # Only watch source directories — never generated output like logs/
         reload_dirs=["app", "config", "routes", "ui"],
-        reload_excludes=["logs/*", "*.log"],
+        reload_excludes=["logs/*", "*.log", "cache/*", "data/*"],
     )
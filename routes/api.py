@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
 from app.controllers.health_controller import router as health_router
+from app.controllers.metrics_controller import router as metrics_router
 from routes.project1 import router as project1_router
 
 api_router = APIRouter(prefix="/api")
 api_router.include_router(health_router)
+api_router.include_router(metrics_router)
 api_router.include_router(project1_router)
@@ -1,34 +1,208 @@
 """Routes for Project 1 — AI Website Brochure Generator."""
 
-from fastapi import APIRouter
+import asyncio
+import logging
+
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
 
-from app.controllers.project1_controller import handle_generate_stream
-from app.models.project1_models import BrochureRequest
+from app.controllers.project1_controller import (
+    handle_create_batch,
+    handle_generate_stream,
+    handle_get_batch,
+    handle_get_batch_item,
+    handle_get_job,
+    handle_job_stream,
+    handle_retry_job,
+    handle_submit_job,
+)
+from app.models.project1_models import (
+    BatchItemResponse,
+    BatchRequest,
+    BatchResponse,
+    BrochureRequest,
+    JobResponse,
+)
+from app.services.brochure_generator import (
+    JobStateError,
+    PipelineBusyError,
+    PipelineSubscription,
+)
+
+logger = logging.getLogger("app.routes.project1")
 
 router = APIRouter(prefix="/project1", tags=["project1"])
 
 
-async def _sse_generator(request: BrochureRequest):
-    """Wrap the controller generator in SSE `data:` frames."""
-    async for chunk in handle_generate_stream(request):
-        # SSE format: each chunk as a data frame
-        yield f"data: {chunk}\n\n"
+async def _close_on_disconnect(http_request: Request, stream: PipelineSubscription) -> None:
+    """Close ``stream`` as soon as the client drops the connection.
+
+    Runs alongside the response so a disconnect is noticed even while the
+    pipeline is busy and has nothing to send.
+    """
+    while (await http_request.receive())["type"] != "http.disconnect":
+        pass
+    if not stream.closed:
+        logger.info("Client disconnected — closing brochure stream")
+        stream.close()
+
+
+async def _sse_generator(stream: PipelineSubscription, http_request: Request):
+    """Wrap the controller stream in SSE `data:` frames."""
+    watcher = asyncio.create_task(_close_on_disconnect(http_request, stream))
+    try:
+        async for chunk in stream:
+            # SSE format: each chunk as a data frame
+            yield f"data: {chunk}\n\n"
+        yield "data: [DONE]\n\n"
+    finally:
+        watcher.cancel()
+        stream.close()
+
+
+async def _sse_replay(output: str):
+    """Send a finished job's stored output as one SSE event.
+
+    Every line gets its own ``data:`` field, so a client joining them with
+    newlines (as the SSE spec says) gets the output back exactly:
+
+    >>> async def frames():
+    ...     return [frame async for frame in _sse_replay("# Acme\\n\\nWe build.")]
+    >>> print("".join(asyncio.run(frames())), end="")
+    data: # Acme
+    data:
+    data: We build.
+    <BLANKLINE>
+    data: [DONE]
+    <BLANKLINE>
+    """
+    if output:
+        lines = output.split("\n")
+        yield "".join(f"data: {line}\n" if line else "data:\n" for line in lines) + "\n"
     yield "data: [DONE]\n\n"
 
 
+def _busy(exc: PipelineBusyError) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=str(exc),
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+
 @router.post(
     "/stream",
     summary="Stream brochure generation",
     description="Submit a website URL and receive a streamed brochure via SSE. "
-    "Stage progress updates are sent first, followed by LLM token chunks.",
+    "Stage progress updates are sent first, followed by LLM token chunks. "
+    "Returns 503 with a Retry-After header when the pipeline queue is full.",
 )
-async def stream_brochure(request: BrochureRequest):
+async def stream_brochure(request: BrochureRequest, http_request: Request):
+    try:
+        stream = handle_generate_stream(request)
+    except PipelineBusyError as exc:
+        raise _busy(exc)
+
     return StreamingResponse(
-        _sse_generator(request),
+        _sse_generator(stream, http_request),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "X-Accel-Buffering": "no",
-        },
+        headers=_SSE_HEADERS,
     )
+
+
+@router.post(
+    "/batches",
+    status_code=202,
+    response_model=BatchResponse,
+    summary="Queue a batch of brochures",
+    description="Submit a list of website URLs for background generation. "
+    "Returns a batch ID immediately; poll the batch for per-item status.",
+)
+async def create_batch(request: BatchRequest) -> BatchResponse:
+    return handle_create_batch(request)
+
+
+@router.get("/batches/{batch_id}", response_model=BatchResponse, summary="Batch status")
+async def get_batch(batch_id: str) -> BatchResponse:
+    batch = handle_get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
+
+
+@router.get(
+    "/batches/{batch_id}/items/{index}",
+    response_model=BatchItemResponse,
+    summary="Batch item result",
+    description="Status of one batch item, with the brochure once it is done.",
+)
+async def get_batch_item(batch_id: str, index: int) -> BatchItemResponse:
+    item = handle_get_batch_item(batch_id, index)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Batch item not found")
+    return item
+
+
+@router.post(
+    "/jobs",
+    status_code=202,
+    response_model=JobResponse,
+    summary="Start a background brochure job",
+    description="Submit a website URL; generation continues in the background even "
+    "if the client disconnects. Poll the job or reattach to its stream. "
+    "Returns 503 with a Retry-After header when the pipeline queue is full.",
+)
+async def submit_job(request: BrochureRequest) -> JobResponse:
+    try:
+        return await handle_submit_job(request)
+    except PipelineBusyError as exc:
+        raise _busy(exc)
+
+
+@router.post(
+    "/jobs/{job_id}/retry",
+    status_code=202,
+    response_model=JobResponse,
+    summary="Retry a failed or interrupted job",
+    description="Restart the job's pipeline run; stages that finished before the "
+    "failure are resumed from checkpoints instead of re-scraped or re-summarised. "
+    "Returns 409 if the job is running or done.",
+)
+async def retry_job(job_id: str) -> JobResponse:
+    try:
+        job = await handle_retry_job(job_id)
+    except JobStateError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except PipelineBusyError as exc:
+        raise _busy(exc)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse, summary="Job status and result")
+async def get_job(job_id: str) -> JobResponse:
+    job = await handle_get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get(
+    "/jobs/{job_id}/stream",
+    summary="Reattach to a job's stream",
+    description="SSE stream of the job from its first frame: live while the job "
+    "runs, its stored output once it has finished.",
+)
+async def stream_job(job_id: str, http_request: Request):
+    stream = await handle_job_stream(job_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    body = _sse_replay(stream) if isinstance(stream, str) else _sse_generator(stream, http_request)
+    return StreamingResponse(body, media_type="text/event-stream", headers=_SSE_HEADERS)
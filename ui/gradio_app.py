@@ -2,7 +2,7 @@ import gradio as gr
 import httpx
 
 from config.settings import settings
-from ui.pages.project1 import create_project1_page
+from ui.pages.project1 import close_session_streams, create_project1_page
 
 
 def check_health() -> str:
@@ -48,4 +48,7 @@ def create_gradio_interface() -> gr.Blocks:
             outputs=[home_page, project1_page],
         )
 
+        # Stop brochure pipelines nobody is watching any more
+        demo.unload(close_session_streams)
+
     return demo
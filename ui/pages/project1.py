@@ -1,26 +1,69 @@
 import asyncio
+import logging
 from collections.abc import AsyncGenerator
 
 import gradio as gr
 
-from app.services.brochure_generator import run_pipeline_stream
+from app.services.brochure_generator import (
+    PipelineBusyError,
+    PipelineSubscription,
+    open_pipeline_stream,
+)
+
+logger = logging.getLogger("app.ui.project1")
 
 # Stage-progress prefixes — we accumulate them separately so the final
 # brochure markdown isn't polluted with status emoji lines.
-_STAGE_PREFIXES = ("🔍", "🔗", "📄", "🧹", "✨")
+_STAGE_PREFIXES = ("⏳", "🔍", "🔗", "📄", "🧹", "✨", "📝")
+
+# Open pipeline streams per Gradio session, closed when the tab goes away.
+# A stream leaves the set when its generator ends; an empty set is dropped.
+_session_streams: dict[str, set[PipelineSubscription]] = {}
 
 
-async def _generate_brochure(url: str) -> AsyncGenerator[str, None]:
+async def _generate_brochure(url: str, request: gr.Request) -> AsyncGenerator[str, None]:
     """Async generator that streams progress + brochure tokens to Gradio."""
     if not url or not url.strip():
         yield "⚠️ Please enter a valid URL."
         return
 
+    try:
+        stream = open_pipeline_stream(url.strip())
+    except PipelineBusyError as exc:
+        yield f"⚠️ The server is busy right now — please try again in {exc.retry_after} seconds."
+        return
+
+    # Without a session hash there is no unload to match, so nothing to register
+    session_hash = request.session_hash
+    if session_hash:
+        _session_streams.setdefault(session_hash, set()).add(stream)
     accumulated = ""  # running text shown in the Markdown component
+    try:
+        async for chunk in stream:
+            accumulated += chunk
+            yield accumulated
+    finally:
+        stream.close()
+        session_streams = _session_streams.get(session_hash) if session_hash else None
+        if session_streams is not None:
+            session_streams.discard(stream)
+            if not session_streams:
+                del _session_streams[session_hash]
 
-    async for chunk in run_pipeline_stream(url.strip()):
-        accumulated += chunk
-        yield accumulated
+
+def close_session_streams(request: gr.Request) -> None:
+    """Close the session's open brochure streams (``Blocks.unload`` hook).
+
+    Gradio stops pulling from a generator when the tab closes but never
+    closes it, so without this the pipeline would keep running for nobody.
+    """
+    if not request.session_hash:
+        return
+    streams = _session_streams.pop(request.session_hash, set())
+    for stream in streams:
+        if not stream.closed:
+            logger.info("Gradio session closed — closing brochure stream")
+            stream.close()
 
 
 def create_project1_page() -> tuple[gr.Column, gr.Button]: